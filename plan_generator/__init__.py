@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Project plan generation from company overview PDFs: parsing (parser, pdf, overview),
+the Overview records (model), computed tables (tables), prompts and Gemini calls
+(prompts, guardrail, llm), the render context (context), Markdown rendering (render)
+and an indexed store of parsed overviews (corpus).
+
+Importing the package does no work and loads none of pdfminer, pdfplumber, jinja2,
+requests or google.generativeai; each public name below is imported from its
+submodule on first access. `python -m plan_generator overview.pdf` runs the pipeline.
+"""
+
+import importlib
+
+# public name -> submodule defining it
+_EXPORTS = {
+    "Budget": "model",
+    "Deliverable": "model",
+    "KPI": "model",
+    "Milestone": "model",
+    "Overview": "model",
+    "Person": "model",
+    "Risk": "model",
+    "TableBlock": "model",
+    "to_jsonable": "model",
+    "MANDATORY_FIELDS": "parser",
+    "OverviewTextAccumulator": "parser",
+    "missing_mandatory_fields": "parser",
+    "parse_overview": "parser",
+    "parse_overview_text": "parser",
+    "TEXT_BACKENDS": "pdf",
+    "extract_text_from_pdf": "pdf",
+    "iter_pdf_page_texts": "pdf",
+    "pdf_page_count": "pdf",
+    "ParseCache": "overview",
+    "load_overview": "overview",
+    "parse_single_pdf": "overview",
+    "TABLE_SECTIONS": "tables",
+    "plan_tables": "tables",
+    "Corpus": "corpus",
+    "PlanMetrics": "metrics",
+    "record_metrics": "metrics",
+    "NARRATIVE_KEYS": "prompts",
+    "SECTION_KEYS": "prompts",
+    "SYSTEM_PROMPT": "prompts",
+    "TEMPLATE_SECTIONS": "prompts",
+    "build_prompt": "prompts",
+    "check_frozen_values": "guardrail",
+    "generate_plan_text_blocks": "llm",
+    "generate_plan_text_blocks_async": "llm",
+    "generate_plan_text_blocks_concurrent": "llm",
+    "iter_plan_text_blocks": "llm",
+    "iter_plan_text_blocks_async": "llm",
+    "categorize_for_aea_template_llm_only": "context",
+    "FragmentRenderer": "render",
+    "plan_env": "render",
+    "render_plan_to_file": "render",
+    "render_plans": "render",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generate a project plan from an overview PDF: parse, generate the sections with
+Gemini (GEMINI_API_KEY; GEMINI_API_BASE for the concurrent REST path), then render
+the Markdown plan.
+
+Usage: python3 -m plan_generator pdfs/Asteria_Overview.pdf [--out out/ProjectPlan_Output.md]
+                                 [--concurrent] [--max-concurrency 4] [--refresh] [--print-blocks]
+"""
+
+import sys
+import json
+import argparse
+
+from .context import categorize_for_aea_template_llm_only
+from .llm import generate_plan_text_blocks, generate_plan_text_blocks_concurrent
+from .overview import load_overview
+from .render import render_plan_to_file
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python3 -m plan_generator", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("pdf", help="company overview PDF")
+    ap.add_argument("--out", default="out/ProjectPlan_Output.md", help="Markdown plan to write")
+    ap.add_argument("--concurrent", action="store_true", help="one REST request per section")
+    ap.add_argument("--max-concurrency", type=int, default=4)
+    ap.add_argument("--refresh", action="store_true", help="ignore cached model replies")
+    ap.add_argument("--print-blocks", action="store_true", help="print the generated section blocks")
+    args = ap.parse_args(argv)
+
+    overview = load_overview(args.pdf)
+    if args.concurrent:
+        blocks = generate_plan_text_blocks_concurrent(overview, max_concurrency=args.max_concurrency,
+                                                      refresh=args.refresh)
+    else:
+        blocks = generate_plan_text_blocks(overview, refresh=args.refresh)
+    if args.print_blocks:
+        print(json.dumps(blocks, indent=2, ensure_ascii=False))
+
+    out_file = render_plan_to_file(categorize_for_aea_template_llm_only(blocks), args.out)
+    print(f"Saved to {out_file}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Render context for the plan template, built from the generated section blocks only.
+"""
+
+from typing import Dict
+
+from .model import Deliverable, TableBlock
+from .parser import _clean
+
+
+def categorize_for_aea_template_llm_only(llm_blocks: Dict[str, any]) -> Dict[str, any]:
+    """
+    Build a render-ready context using ONLY llm_blocks. The blocks are read, never
+    mutated, so they are referenced rather than copied; tables become TableBlock and
+    reporting rows Deliverable records (to_jsonable turns the context back into JSON).
+    """
+    lb = llm_blocks
+
+    # --- Narrative strings ---
+    aim_text            = _clean(lb.get("aim_text"))
+    objective_text      = _clean(lb.get("objective_text"))
+    scope_text          = _clean(lb.get("scope_text"))
+    implementation_text = _clean(lb.get("implementation_text"))
+    governance_text     = _clean(lb.get("governance_text"))
+    partner_org         = _clean(lb.get("partner_org"))
+    comms_text          = _clean(lb.get("comms_text"))
+    pir_text            = _clean(lb.get("pir_text"))
+
+    # --- Structured blocks (tables/dicts) ---
+    project_budget   = lb.get("project_budget", {}) or {}
+    payment_schedule = lb.get("payment_schedule", {}) or {}
+    miles_outcomes   = TableBlock.from_value(lb.get("miles_outcomes"))
+    evaluation_text  = TableBlock.from_value(lb.get("evaluation_text"))
+
+    # Reporting may be a dict with deliverables (list). Keep both a narrative and a table form.
+    reporting_block = lb.get("reporting", {}) or {}
+    reporting_narrative = ""
+    reporting_table = []
+    if isinstance(reporting_block, dict):
+        # accept {"deliverables":[{name, description, due_date}]}
+        for d in reporting_block.get("deliverables", []) or []:
+            if isinstance(d, dict):
+                reporting_table.append(Deliverable(
+                    name=_clean(d.get("name", "")),
+                    description=_clean(d.get("description", "")),
+                    due=_clean(d.get("due_date", d.get("due", ""))),
+                ))
+    elif isinstance(reporting_block, str):
+        reporting_narrative = _clean(reporting_block)
+
+    # --- Safe defaults for template's factual expectations ---
+    project = {
+        "title": "Project Plan",
+        "objective": "",
+        "problem": "",
+        "outcomes": [],
+        "company": "",
+        "product": "",
+        "summary": "",
+        "trl": {"start": None, "end": None},
+    }
+    people = {
+        "sponsor": {"name": "", "role": ""},
+        "lead": {"name": "", "role": ""},
+        "team": [],
+    }
+    schedule = {"start": "", "end": "", "milestones": []}
+    budget = {"currency": "AUD", "total": 0, "capex": 0, "opex": 0, "contingency_percent": 0, "funding_sources": []}
+    kpis, risks = [], []
+
+    # --- Final context ---
+    context = {
+        # factual shells (kept empty/safe)
+        "project": project,
+        "people": people,
+        "schedule": schedule,
+        "budget": budget,
+        "kpis": kpis,
+        "risks": risks,
+
+        # narratives
+        "aim_text": aim_text,
+        "objective_text": objective_text,
+        "scope_text": scope_text,
+        "implementation_text": implementation_text,
+        "governance_text": governance_text,
+        "partner_org": partner_org,
+        "comms_text": comms_text,
+        "pir_text": pir_text,
+
+        # structured blocks from LLM
+        "project_budget": project_budget,
+        "payment_schedule": payment_schedule,
+        "miles_outcomes": miles_outcomes,
+        "evaluation_text": evaluation_text,
+
+        # reporting (narrative + table)
+        "reporting_narrative": reporting_narrative,
+        "reporting_table": reporting_table,
+    }
+    return context
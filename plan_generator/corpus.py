@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Corpus of parsed overviews with indexed queries, so questions over hundreds of
+projects ("TRL 6 start, budget over 1M AUD, a risk owned by the CTO") don't re-parse
+every PDF. The store is one JSONL file of Overview dicts keyed by PDF content hash;
+on load it builds sorted secondary indexes over the scalar fields (equality and range
+lookups by bisect) and an inverted token index over the text fields.
+
+Usage: python3 -m plan_generator.corpus add pdfs/ [more.pdf ...]
+       python3 -m plan_generator.corpus query "trl_start=6" "budget.total>1M" "currency=AUD" "risks:CTO"
+       python3 -m plan_generator.corpus stats
+The store is PLAN_CORPUS_PATH (default corpus/overviews.jsonl), or --store.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .model import Overview
+
+PLAN_CORPUS_PATH = os.getenv("PLAN_CORPUS_PATH", "corpus/overviews.jsonl")
+
+
+def _iso(s: str) -> Optional[str]:
+    s = (s or "").replace("/", "-")
+    return s if re.fullmatch(r"\d{4}-\d{2}-\d{2}", s) else None
+
+
+def _amount(s: str) -> float:
+    """1500000, 1,500,000, 1.5M or 750k."""
+    s = s.replace(",", "").strip()
+    scale = {"k": 1e3, "m": 1e6, "b": 1e9}.get(s[-1:].lower(), 1)
+    return float(s[:-1] if scale != 1 else s) * scale
+
+
+# Scalar fields: name -> (value from an Overview, parser for query literals). A None
+# value (the parser's "not found" 0 / "" / None) leaves the project out of the index.
+SCALAR_FIELDS: Dict[str, Tuple[Callable[[Overview], object], Callable[[str], object]]] = {
+    "trl_start": (lambda ov: ov.trl_start, int),
+    "trl_end": (lambda ov: ov.trl_end, int),
+    "start_date": (lambda ov: _iso(ov.start_date), lambda s: _iso(s) or s),
+    "end_date": (lambda ov: _iso(ov.end_date), lambda s: _iso(s) or s),
+    "budget.total": (lambda ov: ov.budget.total or None, _amount),
+    "budget.capex": (lambda ov: ov.budget.capex or None, _amount),
+    "budget.opex": (lambda ov: ov.budget.opex or None, _amount),
+    "currency": (lambda ov: ov.budget.currency.upper() or None, str.upper),
+}
+
+# Text fields: name -> the strings of an Overview that are tokenised into the inverted index
+TEXT_FIELDS: Dict[str, Callable[[Overview], Iterable[str]]] = {
+    "title": lambda ov: (ov.project_title, ov.company_name, ov.product_name),
+    "problem_statement": lambda ov: (ov.problem_statement,),
+    "risks": lambda ov: (f"{r.description} {r.owner} {r.mitigation}" for r in ov.risks),
+    "risk_owner": lambda ov: (r.owner for r in ov.risks),
+    "stakeholders": lambda ov: ov.stakeholders,
+    "partners": lambda ov: ov.partners,
+    "team": lambda ov: (f"{p.name} {p.role}" for p in (ov.sponsor, ov.lead, *ov.team)),
+}
+
+_TOKEN_RE = re.compile(r"\w+")
+_CONDITION_RE = re.compile(r"^\s*([\w.]+)\s*(<=|>=|!=|=|<|>|:)\s*(.+?)\s*$")
+
+
+def tokens(text: str) -> Set[str]:
+    return {t.lower() for t in _TOKEN_RE.findall(text or "")}
+
+
+class ScalarIndex:
+    """Sorted (value, doc id) pairs for one field; equality and range lookups by bisect."""
+
+    def __init__(self, pairs: Iterable[Tuple[object, str]]):
+        pairs = sorted(pairs)
+        self.values = [v for v, _ in pairs]
+        self.ids = [i for _, i in pairs]
+
+    def range(self, lo=None, hi=None, lo_inclusive: bool = True, hi_inclusive: bool = True) -> Set[str]:
+        start = 0 if lo is None else (bisect_left if lo_inclusive else bisect_right)(self.values, lo)
+        end = len(self.values) if hi is None else (bisect_right if hi_inclusive else bisect_left)(self.values, hi)
+        return set(self.ids[start:end])
+
+    def lookup(self, op: str, value) -> Set[str]:
+        if op == "=":
+            return self.range(value, value)
+        if op == "!=":
+            return set(self.ids) - self.range(value, value)
+        if op in ("<", "<="):
+            return self.range(hi=value, hi_inclusive=op == "<=")
+        return self.range(lo=value, lo_inclusive=op == ">=")
+
+
+class Corpus:
+    """
+    Parsed overviews by id (the PDF content hash), with indexes rebuilt lazily after
+    changes. query() takes conditions like "trl_start>=6", "budget.total>1M",
+    "currency=AUD" or "risks:cto owner" (every word must appear in that text field).
+    """
+
+    def __init__(self, path: str = PLAN_CORPUS_PATH):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self.overviews: Dict[str, Overview] = {}
+        self._scalar: Optional[Dict[str, ScalarIndex]] = None
+        self._inverted: Optional[Dict[str, Dict[str, Set[str]]]] = None
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted write
+                    self._put(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _put(self, entry: Dict) -> None:
+        self.entries[entry["id"]] = entry
+        self.overviews[entry["id"]] = Overview.from_dict(entry["overview"])
+        self._scalar = self._inverted = None
+
+    # ---- Loading ----
+    def add(self, overview: Overview, source: str, doc_id: Optional[str] = None) -> str:
+        """Add or replace one overview; call save() to persist."""
+        doc_id = doc_id or hashlib.sha256(json.dumps(overview.to_dict(), sort_keys=True).encode()).hexdigest()[:16]
+        self._put({"id": doc_id, "source": source, "added": time.time(), "overview": overview.to_dict()})
+        return doc_id
+
+    def add_pdfs(self, paths: List[str], workers: Optional[int] = None) -> List[str]:
+        """Parse PDFs (through the parse cache, one process per CPU) and add them, keyed by content hash."""
+        from .overview import load_overview
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+        if workers == 1:
+            overviews = map(load_overview, paths)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            overviews = pool.map(load_overview, paths)
+        try:
+            return [self.add(ov, str(p), _file_hash(p)) for p, ov in zip(paths, overviews)]
+        finally:
+            if workers > 1:
+                pool.shutdown()
+
+    def remove(self, doc_id: str) -> bool:
+        if self.entries.pop(doc_id, None) is None:
+            return False
+        del self.overviews[doc_id]
+        self._scalar = self._inverted = None
+        return True
+
+    def save(self) -> None:
+        """Rewrite the store atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.path)
+
+    # ---- Indexes ----
+    def _build_indexes(self) -> None:
+        scalar = {name: [] for name in SCALAR_FIELDS}
+        inverted = {name: {} for name in TEXT_FIELDS}
+        for doc_id, ov in self.overviews.items():
+            for name, (get, _) in SCALAR_FIELDS.items():
+                value = get(ov)
+                if value is not None:
+                    scalar[name].append((value, doc_id))
+            for name, get in TEXT_FIELDS.items():
+                postings = inverted[name]
+                for tok in tokens(" ".join(get(ov))):
+                    postings.setdefault(tok, set()).add(doc_id)
+        self._scalar = {name: ScalarIndex(pairs) for name, pairs in scalar.items()}
+        self._inverted = inverted
+
+    def _matching(self, field: str, op: str, literal: str) -> Set[str]:
+        if op == ":":
+            if field not in TEXT_FIELDS:
+                raise ValueError(f"unknown text field {field!r}; expected one of {', '.join(TEXT_FIELDS)}")
+            postings = self._inverted[field]
+            words = tokens(literal)
+            if not words:
+                return set(self.entries)
+            # Rarest word first, so the intersection starts small
+            sets = sorted((postings.get(w, set()) for w in words), key=len)
+            return set.intersection(*sets)
+        if field not in SCALAR_FIELDS:
+            raise ValueError(f"unknown field {field!r}; expected one of {', '.join(SCALAR_FIELDS)}")
+        try:
+            value = SCALAR_FIELDS[field][1](literal)
+        except ValueError:
+            raise ValueError(f"bad value for {field}: {literal!r}") from None
+        return self._scalar[field].lookup(op, value)
+
+    def query(self, conditions: Iterable[str]) -> List[Dict]:
+        """Entries matching every condition (all entries when there are none), ordered by source."""
+        if self._scalar is None:
+            self._build_indexes()
+        ids: Optional[Set[str]] = None
+        for cond in conditions:
+            m = _CONDITION_RE.match(cond)
+            if not m:
+                raise ValueError(f"cannot parse condition {cond!r} (expected field<op>value or field:words)")
+            found = self._matching(*m.groups())
+            ids = found if ids is None else ids & found
+            if not ids:
+                return []
+        ids = set(self.entries) if ids is None else ids
+        return sorted((self.entries[i] for i in ids), key=lambda e: e["source"])
+
+    def stats(self) -> Dict:
+        if self._scalar is None:
+            self._build_indexes()
+        return {
+            "projects": len(self.entries),
+            "scalar_fields": {name: len(index.values) for name, index in self._scalar.items()},
+            "text_fields": {name: len(postings) for name, postings in self._inverted.items()},
+        }
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def _pdf_inputs(sources: List[str]) -> List[str]:
+    paths = []
+    for src in map(Path, sources):
+        paths += [str(p) for p in sorted(src.glob("*.pdf"))] if src.is_dir() else [str(src)]
+    return paths
+
+
+def _summary(entry: Dict) -> Dict:
+    ov = entry["overview"]
+    budget = ov.get("budget") or {}
+    return {
+        "id": entry["id"],
+        "source": entry["source"],
+        "project_title": ov.get("project_title", ""),
+        "trl": [ov.get("trl_start"), ov.get("trl_end")],
+        "dates": [ov.get("start_date", ""), ov.get("end_date", "")],
+        "budget": f"{budget.get('total', 0):,.2f} {budget.get('currency', '')}".strip(),
+    }
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python3 -m plan_generator.corpus", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--store", default=PLAN_CORPUS_PATH, help="corpus JSONL file (default: %(default)s)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("add", help="parse PDFs (or directories of PDFs) into the corpus")
+    add.add_argument("sources", nargs="+")
+    add.add_argument("--workers", type=int, default=None, help="parsing processes (default: CPU count)")
+    rm = sub.add_parser("remove", help="drop projects by id")
+    rm.add_argument("ids", nargs="+")
+    q = sub.add_parser("query", help="projects matching every condition",
+                       epilog=f"scalar fields: {', '.join(SCALAR_FIELDS)}; text fields: {', '.join(TEXT_FIELDS)}")
+    q.add_argument("conditions", nargs="*", help='e.g. "trl_start=6" "budget.total>1M" "risks:CTO"')
+    q.add_argument("--full", action="store_true", help="print whole overviews instead of summaries")
+    q.add_argument("--ids", action="store_true", help="print only the matching ids")
+    sub.add_parser("stats", help="project and index sizes")
+    args = ap.parse_args(argv)
+
+    corpus = Corpus(args.store)
+    if args.command == "add":
+        ids = corpus.add_pdfs(_pdf_inputs(args.sources), args.workers)
+        corpus.save()
+        print(json.dumps({"added": len(ids), "projects": len(corpus)}))
+    elif args.command == "remove":
+        removed = sum(corpus.remove(i) for i in args.ids)
+        corpus.save()
+        print(json.dumps({"removed": removed, "projects": len(corpus)}))
+    elif args.command == "query":
+        t0 = time.perf_counter()
+        try:
+            entries = corpus.query(args.conditions)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        elapsed = (time.perf_counter() - t0) * 1000
+        for entry in entries:
+            if args.ids:
+                print(entry["id"])
+            else:
+                print(json.dumps(entry if args.full else _summary(entry), ensure_ascii=False))
+        print(f"{len(entries)} of {len(corpus)} projects in {elapsed:.2f} ms", file=sys.stderr)
+    else:
+        print(json.dumps(corpus.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
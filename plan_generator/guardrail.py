@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Frozen-value guardrail: the TRLs the model must carry over unchanged, checked in one
+Aho-Corasick pass over all generated blocks. The budget, payment, milestone and
+reporting tables are computed from the overview (tables.py), so they are not checked.
+"""
+
+import re
+from bisect import bisect_right
+from collections import deque
+
+# Values the model must carry over unchanged, and the section each one belongs in.
+# All blocks are normalised into one text and scanned once with an Aho-Corasick
+# automaton holding every frozen value.
+GUARDRAIL_RETRIES = 2
+_TRL_TOKEN_RE = re.compile(r"\btrl[\s\-:]*(\d)")
+# "trl 4 to 7", "trls 4–7", "trl-4 - trl-7", "trls 4 and 7": both ends written out as "trl n"
+_TRL_RANGE_RE = re.compile(
+    r"\btrls?[\s\-:]*(\d)\s*(?:to|through|and|-|–|—|→)\s*(?:trls?[\s\-:]*)?(\d)\b")
+
+
+def normalise_frozen_text(text):
+    """Lowercase; TRL-6 -> trl 6, TRLs 4–7 -> trl 4 to trl 7."""
+    text = _TRL_RANGE_RE.sub(r"trl \1 to trl \2", str(text).lower())
+    return _TRL_TOKEN_RE.sub(r"trl \1", text)
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: every occurrence of every pattern in one pass over the text."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto, self.fail, self.out = [{}], [0], [[]]
+        for i, pat in enumerate(self.patterns):
+            node = 0
+            for ch in pat:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.out[node].append(i)
+        queue = deque(self.goto[0].values())  # breadth-first, so fail targets are done first
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] += self.out[self.fail[child]]
+
+    def finditer(self, text):
+        """Yield (start, end, pattern_index) for every match."""
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for i in self.out[node]:
+                yield pos + 1 - len(self.patterns[i]), pos + 1, i
+
+
+def _whole_token(text, start, end):
+    # "trl 4" must not match inside "trl 45" or "trl 4.5"
+    before = text[start - 1] if start else " "
+    after = text[end] if end < len(text) else " "
+    decimal_after = after == "." and end + 1 < len(text) and text[end + 1].isdigit()
+    return not before.isalnum() and not after.isalnum() and not decimal_after and before != "."
+
+
+# What a replacement TRL looks like, to tell "altered" from "dropped"
+_TRL_VALUE_RE = re.compile(r"\btrl \d\b")
+
+
+def frozen_values(canonical):
+    """(section, label, normalised token) for every value a narrative section must reproduce exactly."""
+    return [("aim_text", field, f"trl {canonical[field]}")
+            for field in ("trl_start", "trl_end") if canonical.get(field) is not None]
+
+
+def _block_text(block):
+    if isinstance(block, dict):
+        return " | ".join(_block_text(v) for v in block.values())
+    if isinstance(block, (list, tuple)):
+        return " | ".join(_block_text(v) for v in block)
+    return "" if block is None else str(block)
+
+
+def check_frozen_values(canonical, blocks):
+    """
+    {section: [problem, ...]} for sections that dropped or altered a frozen value.
+    Only sections present in `blocks` are checked.
+    """
+    expected = [v for v in frozen_values(canonical) if v[0] in blocks]
+    if not expected:
+        return {}
+    sections, starts, parts, pos = [], [], [], 0
+    for name, block in blocks.items():
+        text = normalise_frozen_text(_block_text(block))
+        sections.append(name)
+        starts.append(pos)
+        parts.append(text)
+        pos += len(text) + 1
+    text = "\n".join(parts)
+
+    tokens = sorted({tok for _, _, tok in expected})
+    found = set()
+    for start, end, i in AhoCorasick(tokens).finditer(text):
+        if _whole_token(text, start, end):
+            found.add((sections[bisect_right(starts, start) - 1], tokens[i]))
+
+    problems = {}
+    frozen_tokens = set(tokens)
+    for section, label, tok in expected:
+        if (section, tok) in found:
+            continue
+        section_text = parts[sections.index(section)]
+        others = sorted({m.group(0) for m in _TRL_VALUE_RE.finditer(section_text)} - frozen_tokens)
+        problem = f"{label} {tok!r} altered (found {', '.join(map(repr, others))})" if others \
+            else f"{label} {tok!r} dropped"
+        problems.setdefault(section, []).append(problem)
+    return problems
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemini section generation: narrative sections from the model (one request through the
+SDK, or concurrent per-section requests through the REST API), tables from the table
+engine, frozen values checked by the guardrail and replies cached on disk.
+google.generativeai is imported on first use, and the key is read from GEMINI_API_KEY.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Union
+
+import requests
+
+from .guardrail import GUARDRAIL_RETRIES, check_frozen_values
+from .model import Overview, to_jsonable
+from .prompts import NARRATIVE_KEYS, SECTION_KEYS, SYSTEM_PROMPT, TEMPLATE_SECTIONS, build_prompt, record_usage
+from .tables import TABLE_SECTIONS, plan_tables
+
+# ---------- Gemini config ----------
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_MODEL = "gemini-2.5-flash-lite"
+GENERATION_CONFIG = {"temperature": 0.4, "response_mime_type": "application/json"}  # JSON output enforced
+# REST endpoint for the concurrent path; point it at stub_model_server.py for local runs
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+
+# Optional grouping for fewer requests: sections that draw on the same figures go together
+SECTION_GROUPS = [
+    ["aim_text", "objective_text", "scope_text"],
+    ["implementation_text", "governance_text", "partner_org"],
+    ["comms_text", "evaluation_text", "pir_text"],
+]
+
+
+@lru_cache(maxsize=None)
+def _genai():
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai
+
+
+def _log(message):
+    print(message, file=sys.stderr)
+
+
+def _canonical_dict(canonical: Union[Overview, Dict]) -> Dict:
+    return canonical.to_dict() if isinstance(canonical, Overview) else canonical
+
+
+# ---------- LLM response cache ----------
+LLM_CACHE_DIR = Path(os.getenv("PLAN_LLM_CACHE_DIR", "cache/llm"))
+LLM_CACHE_TTL = float(os.getenv("PLAN_LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+LLM_CACHE_MAX_BYTES = int(os.getenv("PLAN_LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def llm_cache_key(canonical, *extra):
+    """
+    Hash of everything that determines the model's reply: the input dict (canonical
+    JSON, so key order doesn't matter), both prompts, model name and generation config.
+    `extra` distinguishes different requests for the same input (e.g. section keys).
+    """
+    payload = json.dumps(
+        [canonical, SYSTEM_PROMPT, TEMPLATE_SECTIONS, GEMINI_MODEL, GENERATION_CONFIG, list(extra)],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Model replies on disk, one JSON file per key. Entries older than `ttl` seconds are
+    treated as misses; once the directory grows past `max_bytes`, the least recently
+    used entries (hits touch the file's mtime) are deleted.
+    """
+
+    def __init__(self, path=LLM_CACHE_DIR, ttl=LLM_CACHE_TTL, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def get(self, key):
+        p = self.path / f"{key}.json"
+        try:
+            entry = json.loads(p.read_text(encoding="utf-8"))
+            if time.time() - entry["created"] > self.ttl:
+                p.unlink(missing_ok=True)
+                return None
+            os.utime(p)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry["response"]
+
+    def put(self, key, response):
+        self.path.mkdir(parents=True, exist_ok=True)
+        p = self.path / f"{key}.json"
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"created": time.time(), "response": response}, ensure_ascii=False),
+                       encoding="utf-8")
+        os.replace(tmp, p)
+        self._evict()
+
+    def _evict(self):
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(self.path)
+                   if e.name.endswith(".json")]
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+llm_cache = LLMResponseCache()
+
+
+# ---------- the LLM call ----------
+def _with_tables(canonical, narrative):
+    """Narrative blocks from the model plus the computed tables, in SECTION_KEYS order."""
+    blocks = {**narrative, **to_jsonable(plan_tables(Overview.from_dict(canonical)))}
+    return {k: blocks[k] for k in SECTION_KEYS if k in blocks}
+
+
+def _generate_blocks_sdk(canonical, keys=SECTION_KEYS):
+    system_prompt, user_prompt, stats = build_prompt(canonical, keys)
+
+    # Build a Gemini model with JSON output enforced
+    genai = _genai()
+    model = genai.GenerativeModel(
+        model_name=GEMINI_MODEL,
+        system_instruction=system_prompt,
+        generation_config=genai.types.GenerationConfig(**GENERATION_CONFIG)
+    )
+
+    resp = model.generate_content(user_prompt)
+    usage = getattr(resp, "usage_metadata", None)
+    record_usage(stats, getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None))
+    _log(f"[tokens] {stats}")
+
+    # Gemini returns JSON text in resp.text
+    return json.loads(resp.text)
+
+
+def generate_plan_text_blocks(canonical, refresh=False):
+    """
+    Narrative sections from the model, tables from the table engine. canonical is an
+    Overview or its dict. refresh=True skips the cache lookup (forced regeneration);
+    the new reply is still cached.
+    """
+    canonical = _canonical_dict(canonical)
+    key = llm_cache_key(canonical, *NARRATIVE_KEYS)
+    if not refresh:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return _with_tables(canonical, cached)
+
+    blocks = _generate_blocks_sdk(canonical, NARRATIVE_KEYS)
+
+    # ------------ guardrail: verify frozen numerics/dates weren't changed ------------
+    # Only the sections that lost a value are regenerated
+    problems = check_frozen_values(canonical, blocks)
+    for _ in range(GUARDRAIL_RETRIES):
+        if not problems:
+            break
+        _log(f"[guardrail] regenerating {sorted(problems)}: {problems}")
+        retry = _generate_blocks_sdk(canonical, sorted(problems))
+        blocks.update({k: v for k, v in retry.items() if k in problems})
+        problems = check_frozen_values(canonical, blocks)
+    if problems:
+        _log(f"[guardrail] frozen values still wrong, not caching: {problems}")
+        return _with_tables(canonical, blocks)
+
+    llm_cache.put(key, blocks)
+    return _with_tables(canonical, blocks)
+
+
+# ---------- concurrent per-section generation ----------
+# Each section (or small group of sections) is its own request, so the plan takes
+# about as long as the slowest section instead of all ~3,000 words in sequence, and
+# a malformed section is retried on its own.
+def _gemini_generate_json(canonical, keys, api_key, model=GEMINI_MODEL, timeout=120):
+    system_prompt, user_prompt, stats = build_prompt(canonical, keys)
+    url = f"{GEMINI_API_BASE}/models/{model}:generateContent"
+    body = {
+        "systemInstruction": {"parts": [{"text": system_prompt}]},
+        "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+        "generationConfig": GENERATION_CONFIG,
+    }
+    response = requests.post(url, params={"key": api_key}, json=body, timeout=timeout)
+    response.raise_for_status()
+    reply = response.json()
+    usage = reply.get("usageMetadata", {})
+    record_usage(stats, usage.get("promptTokenCount"), usage.get("candidatesTokenCount"))
+    parts = reply["candidates"][0]["content"]["parts"]
+    return json.loads("".join(p.get("text", "") for p in parts))
+
+
+async def _generate_sections(canonical, keys, semaphore, api_key, retries, backoff, refresh):
+    """
+    Generate `keys` in one request; keys missing from a reply, or failing the frozen-value
+    guardrail, are re-requested on their own. Sections that still fail the guardrail after
+    the last attempt are kept (with a warning) rather than failing the plan.
+    """
+    cache_key = llm_cache_key(canonical, *keys)
+    cached = None if refresh else llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    got, flagged, pending, error = {}, {}, list(keys), None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff * 2 ** (attempt - 1) * (0.5 + random.random()))
+        async with semaphore:
+            try:
+                out = await asyncio.to_thread(_gemini_generate_json, canonical, pending, api_key)
+            except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+                error = e
+                continue
+        fresh = {k: out[k] for k in pending if isinstance(out, dict) and k in out}
+        problems = check_frozen_values(canonical, fresh)
+        flagged.update({k: v for k, v in fresh.items() if k in problems})
+        got.update({k: v for k, v in fresh.items() if k not in problems})
+        pending = [k for k in pending if k not in got]
+        if not pending:
+            llm_cache.put(cache_key, got)
+            return got
+        missing = [k for k in pending if k not in fresh]
+        error = ValueError(f"reply is missing {missing}" if missing else f"frozen values wrong: {problems}")
+    if all(k in flagged for k in pending):
+        _log(f"[guardrail] keeping {pending} with frozen values still wrong: {error}")
+        return {**got, **{k: flagged[k] for k in pending}}
+    raise RuntimeError(f"sections {pending} failed after {retries + 1} attempts: {error}")
+
+
+def _request_groups(groups):
+    """Narrative keys per request: one section each by default, TABLE_SECTIONS dropped."""
+    if groups is None:
+        groups = [[k] for k in NARRATIVE_KEYS]
+    groups = [[k for k in keys if k not in TABLE_SECTIONS] for keys in groups]
+    return [keys for keys in groups if keys]
+
+
+async def generate_plan_text_blocks_async(canonical, groups=None, max_concurrency=4, retries=2,
+                                          backoff=1.0, api_key=None, refresh=False):
+    """
+    Same blocks dict as generate_plan_text_blocks, built from concurrent requests.
+    groups: lists of narrative section keys per request (default: one section per request,
+    SECTION_GROUPS for fewer, larger requests); TABLE_SECTIONS are always computed locally.
+    At most max_concurrency requests run at once; each group is retried up to `retries`
+    times with jittered backoff.
+    Each group's reply is cached separately; refresh=True regenerates them all.
+    """
+    canonical = _canonical_dict(canonical)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(
+        *(_generate_sections(canonical, keys, semaphore, api_key or GEMINI_API_KEY, retries, backoff, refresh)
+          for keys in _request_groups(groups)),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        raise RuntimeError("; ".join(str(f) for f in failures))
+    blocks = {}
+    for r in results:
+        blocks.update(r)
+    return _with_tables(canonical, blocks)
+
+
+def generate_plan_text_blocks_concurrent(canonical, **kwargs):
+    """Blocking wrapper. Inside a running event loop (Colab/Jupyter), `await generate_plan_text_blocks_async(...)` instead."""
+    return asyncio.run(generate_plan_text_blocks_async(canonical, **kwargs))
+
+
+async def iter_plan_text_blocks_async(canonical, groups=None, max_concurrency=4, retries=2,
+                                      backoff=1.0, api_key=None, refresh=False):
+    """
+    (section_key, block) pairs as they become ready: the computed tables first, then each
+    group's sections as soon as its request completes (asyncio.as_completed). Arguments as
+    for generate_plan_text_blocks_async; a failed group is raised once every other group
+    has been yielded.
+    """
+    canonical = _canonical_dict(canonical)
+    for item in to_jsonable(plan_tables(Overview.from_dict(canonical))).items():
+        yield item
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [asyncio.ensure_future(_generate_sections(canonical, keys, semaphore, api_key or GEMINI_API_KEY,
+                                                      retries, backoff, refresh))
+             for keys in _request_groups(groups)]
+    failures = []
+    try:
+        for done in asyncio.as_completed(tasks):
+            try:
+                blocks = await done
+            except Exception as e:
+                failures.append(e)
+                continue
+            for item in blocks.items():
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()  # the consumer stopped early
+    if failures:
+        raise RuntimeError("; ".join(str(f) for f in failures))
+
+
+def iter_plan_text_blocks(canonical, **kwargs):
+    """Blocking iterator over iter_plan_text_blocks_async, on an event loop of its own."""
+    loop = asyncio.new_event_loop()
+    sections = iter_plan_text_blocks_async(canonical, **kwargs)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(sections.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(sections.aclose())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-request instrumentation for plan generation: timed stage spans (wall time,
+CPU time, optional traced heap peak), the process's peak RSS, and counters (pages,
+characters, sections, retries, cache hits), reported in the JSON result and
+appended to a local metrics file.
+
+PLAN_METRICS_FILE selects the file: *.prom is kept as cumulative Prometheus text
+(for a node_exporter textfile collector or any scraper that reads the file),
+anything else gets one JSON object per plan (JSONL).
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import resource
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Empty disables the metrics file
+METRICS_FILE = os.getenv("PLAN_METRICS_FILE", "")
+# Per-stage Python heap peaks via tracemalloc; off by default since it slows parsing noticeably
+METRICS_TRACE_MEMORY = os.getenv("PLAN_METRICS_TRACE_MEMORY", "0") == "1"
+
+
+def _cpu_seconds() -> float:
+    # Includes finished child processes, i.e. the parallel extraction workers
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _max_rss_kib() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # bytes on macOS, KiB on Linux
+
+
+class PlanMetrics:
+    """
+    Spans and counters for one plan. Spans with the same name accumulate (e.g. one
+    "extract" per text backend tried) and keep a call count.
+    """
+
+    def __init__(self, trace_memory: bool = METRICS_TRACE_MEMORY):
+        self.trace_memory = trace_memory
+        self.spans: Dict[str, Dict] = {}
+        self.counters: Dict[str, int] = {}
+        self.status = "ok"
+        self.failed_stage: Optional[str] = None
+        self._started = time.perf_counter()
+        self._cpu_started = _cpu_seconds()
+
+    @contextmanager
+    def span(self, name: str):
+        tracing = self.trace_memory
+        if tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        wall0, cpu0 = time.perf_counter(), _cpu_seconds()
+        try:
+            yield self
+        except BaseException:
+            self.status = "error"
+            self.failed_stage = self.failed_stage or name
+            raise
+        finally:
+            s = self.spans.setdefault(name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            s["calls"] += 1
+            s["wall_ms"] += (time.perf_counter() - wall0) * 1000
+            s["cpu_ms"] += (_cpu_seconds() - cpu0) * 1000
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1] / 1024
+                s["peak_traced_kib"] = max(s.get("peak_traced_kib", 0.0), peak)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> Dict:
+        spans = {
+            name: {k: round(v, 3) if isinstance(v, float) else v for k, v in s.items()}
+            for name, s in self.spans.items()
+        }
+        return {
+            "status": self.status,
+            "failed_stage": self.failed_stage,
+            "wall_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "cpu_ms": round((_cpu_seconds() - self._cpu_started) * 1000, 3),
+            # Lifetime peak of the process, so one figure per plan: it cannot be split by stage
+            "max_rss_kib": _max_rss_kib(),
+            "spans": spans,
+            "counters": dict(self.counters),
+        }
+
+
+# ---- Metrics file ----
+def _prometheus_samples(m: Dict) -> Dict[str, float]:
+    """This plan's contribution to the cumulative series, keyed by 'name{labels}'."""
+    samples = {f'plan_requests_total{{status="{m["status"]}"}}': 1}
+    for stage, s in m["spans"].items():
+        samples[f'plan_stage_calls_total{{stage="{stage}"}}'] = s["calls"]
+        samples[f'plan_stage_wall_seconds_total{{stage="{stage}"}}'] = s["wall_ms"] / 1000
+        samples[f'plan_stage_cpu_seconds_total{{stage="{stage}"}}'] = s["cpu_ms"] / 1000
+    for name, value in m["counters"].items():
+        samples[f'plan_events_total{{event="{name}"}}'] = value
+    return samples
+
+
+_PROMETHEUS_HELP = {
+    "plan_requests_total": ("counter", "Plans generated, by status."),
+    "plan_stage_calls_total": ("counter", "Stage executions."),
+    "plan_stage_wall_seconds_total": ("counter", "Wall time spent per stage."),
+    "plan_stage_cpu_seconds_total": ("counter", "CPU time spent per stage, including worker processes."),
+    "plan_events_total": ("counter", "Pages, characters, sections, retries and cache hits/misses."),
+    "plan_max_rss_kib": ("gauge", "Peak resident memory of the last plan's process."),
+}
+
+
+def _write_prometheus(path: str, m: Dict) -> None:
+    totals: Dict[str, float] = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip() and not line.startswith("#"):
+                    series, _, value = line.rpartition(" ")
+                    totals[series] = float(value)
+    for series, value in _prometheus_samples(m).items():
+        totals[series] = totals.get(series, 0) + value
+    totals["plan_max_rss_kib"] = m["max_rss_kib"]
+
+    lines = []
+    for metric, (kind, help_text) in _PROMETHEUS_HELP.items():
+        series = sorted(s for s in totals if s.split("{")[0] == metric)
+        if series:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            lines += [f"{s} {float(totals[s])!r}" for s in series]
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)  # scrapers never see a half-written file
+
+
+def record_metrics(metrics: PlanMetrics, labels: Dict = None, path: str = METRICS_FILE) -> None:
+    """
+    Append one plan's metrics to `path` (no-op when empty). Concurrent writers are
+    serialised with a lock file; failures are reported on stderr, never raised.
+    """
+    if not path:
+        return
+    m = metrics.to_dict()
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(f"{path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if path.endswith(".prom"):
+                _write_prometheus(path, m)
+            else:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"ts": time.time(), **(labels or {}), **m}, ensure_ascii=False) + "\n")
+    except (OSError, ValueError) as e:
+        print(f"[metrics] could not write {path}: {e}", file=sys.stderr)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Plan data model: the parsed overview and the table blocks of a generated plan as
+frozen, slotted dataclasses. Records are built once, shared read-only between
+parsing, generation and rendering (Jinja reads attributes directly), and turned
+into plain dicts only at the JSON boundary via to_dict / to_jsonable.
+"""
+
+import re
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Dict, Optional, Tuple
+
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _check(cond: bool, message: str) -> None:
+    if not cond:
+        raise ValueError(message)
+
+
+# ---- Records ----
+@dataclass(frozen=True, slots=True)
+class Person:
+    name: str = ""
+    role: str = ""
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "role": self.role}
+
+
+@dataclass(frozen=True, slots=True)
+class Milestone:
+    name: str
+    due: str = ""
+    owner: str = ""
+
+    def __post_init__(self):
+        _check(not self.due or bool(_ISO_DATE_RE.match(self.due)), f"milestone due date is not ISO: {self.due!r}")
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "due": self.due, "owner": self.owner}
+
+
+@dataclass(frozen=True, slots=True)
+class KPI:
+    name: str
+    target: str = ""
+    measure: str = ""
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "target": self.target, "measure": self.measure}
+
+
+@dataclass(frozen=True, slots=True)
+class Risk:
+    id: str
+    description: str
+    likelihood: str = ""
+    impact: str = ""
+    owner: str = ""
+    mitigation: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "description": self.description,
+            "likelihood": self.likelihood,
+            "impact": self.impact,
+            "owner": self.owner,
+            "mitigation": self.mitigation,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Deliverable:
+    name: str
+    due: str = ""
+    description: str = ""
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "description": self.description, "due": self.due}
+
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    currency: str = ""
+    total: float = 0.0
+    capex: float = 0.0
+    opex: float = 0.0
+    contingency_percent: float = 0.0
+    funding_sources: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        _check(not self.currency or (len(self.currency) == 3 and self.currency.isalpha()),
+               f"currency is not an ISO code: {self.currency!r}")
+        for f in ("total", "capex", "opex", "contingency_percent"):
+            _check(getattr(self, f) >= 0, f"budget {f} is negative")
+
+    def to_dict(self) -> Dict:
+        return {
+            "currency": self.currency,
+            "total": self.total,
+            "capex": self.capex,
+            "opex": self.opex,
+            "contingency_percent": self.contingency_percent,
+            "funding_sources": list(self.funding_sources),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TableBlock:
+    """A generated table: column headers plus rows (tuples, or mappings keyed by column)."""
+    columns: Tuple[str, ...] = ()
+    rows: Tuple[Any, ...] = ()
+
+    @classmethod
+    def from_value(cls, block: Any) -> "TableBlock":
+        """Accept whatever the model produced; anything without columns/rows lists is an empty table."""
+        if isinstance(block, TableBlock):
+            return block
+        if not isinstance(block, dict):
+            return cls()
+        cols = block.get("columns") or ()
+        rows = block.get("rows") or ()
+        return cls(
+            tuple(cols) if isinstance(cols, (list, tuple)) else (),
+            tuple(tuple(r) if isinstance(r, list) else r for r in rows) if isinstance(rows, (list, tuple)) else (),
+        )
+
+    def to_dict(self) -> Dict:
+        return {"columns": list(self.columns), "rows": [list(r) if isinstance(r, tuple) else r for r in self.rows]}
+
+
+@dataclass(frozen=True, slots=True)
+class Overview:
+    project_title: str = ""
+    company_name: str = ""
+    product_name: str = ""
+    product_summary: str = ""
+    problem_statement: str = ""
+    objective: str = ""
+    key_outcomes: Tuple[str, ...] = ()
+    start_date: str = ""
+    end_date: str = ""
+    milestones: Tuple[Milestone, ...] = ()
+    budget: Budget = Budget()
+    sponsor: Person = Person()
+    lead: Person = Person()
+    team: Tuple[Person, ...] = ()
+    stakeholders: Tuple[str, ...] = ()
+    partners: Tuple[str, ...] = ()
+    kpis: Tuple[KPI, ...] = ()
+    risks: Tuple[Risk, ...] = ()
+    reporting: Tuple[Deliverable, ...] = ()
+    trl_start: Optional[int] = None
+    trl_end: Optional[int] = None
+
+    def __post_init__(self):
+        for f in ("trl_start", "trl_end"):
+            v = getattr(self, f)
+            _check(v is None or 1 <= v <= 9, f"{f} must be between 1 and 9, got {v}")
+
+    def to_dict(self) -> Dict:
+        """The parse_overview_text dict layout (JSON-ready)."""
+        return {
+            "project_title": self.project_title,
+            "company_name": self.company_name,
+            "product_name": self.product_name,
+            "product_summary": self.product_summary,
+            "problem_statement": self.problem_statement,
+            "objective": self.objective,
+            "key_outcomes": list(self.key_outcomes),
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "milestones": [m.to_dict() for m in self.milestones],
+            "budget": self.budget.to_dict(),
+            "sponsor": self.sponsor.to_dict(),
+            "lead": self.lead.to_dict(),
+            "team": [p.to_dict() for p in self.team],
+            "stakeholders": list(self.stakeholders),
+            "partners": list(self.partners),
+            "kpis": [k.to_dict() for k in self.kpis],
+            "risks": [r.to_dict() for r in self.risks],
+            "reporting": {"deliverables": [{"name": d.name, "due": d.due} for d in self.reporting]},
+            "trl_start": self.trl_start,
+            "trl_end": self.trl_end,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Overview":
+        """Inverse of to_dict (e.g. for cached parses); validates like direct construction."""
+        b = d.get("budget") or {}
+        return cls(
+            project_title=d.get("project_title", ""),
+            company_name=d.get("company_name", ""),
+            product_name=d.get("product_name", ""),
+            product_summary=d.get("product_summary", ""),
+            problem_statement=d.get("problem_statement", ""),
+            objective=d.get("objective", ""),
+            key_outcomes=tuple(d.get("key_outcomes") or ()),
+            start_date=d.get("start_date", ""),
+            end_date=d.get("end_date", ""),
+            milestones=tuple(Milestone(**m) for m in d.get("milestones") or ()),
+            budget=Budget(**{**b, "funding_sources": tuple(b.get("funding_sources") or ())}),
+            sponsor=Person(**(d.get("sponsor") or {})),
+            lead=Person(**(d.get("lead") or {})),
+            team=tuple(Person(**p) for p in d.get("team") or ()),
+            stakeholders=tuple(d.get("stakeholders") or ()),
+            partners=tuple(d.get("partners") or ()),
+            kpis=tuple(KPI(**k) for k in d.get("kpis") or ()),
+            risks=tuple(Risk(**r) for r in d.get("risks") or ()),
+            reporting=tuple(Deliverable(**r) for r in (d.get("reporting") or {}).get("deliverables") or ()),
+            trl_start=d.get("trl_start"),
+            trl_end=d.get("trl_end"),
+        )
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert records (and dicts/lists/tuples holding them) to plain JSON values."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if is_dataclass(value):
+        return {f.name: to_jsonable(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    return value
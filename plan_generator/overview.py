@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Overview PDFs to Overview records: text extraction with backend fallback, parsing,
+and an on-disk cache of parsed results keyed by PDF content and parser version.
+"""
+
+import os
+import json
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from .metrics import PlanMetrics
+from .model import Overview
+from .parser import missing_mandatory_fields, parse_overview
+from .pdf import PDF_TEXT_BACKEND, TEXT_BACKENDS, extract_text_from_pdf
+
+# ---- Parse cache ----
+# Empty PLAN_PARSE_CACHE_DIR disables the cache
+PARSE_CACHE_DIR = os.getenv("PLAN_PARSE_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache" / "overviews"))
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_PARSE_CACHE_MAX_ENTRIES", "256"))
+# Any edit to these modules (parser, backends, records, mandatory fields) changes every cache key
+_VERSIONED_MODULES = ["model.py", "parser.py", "pdf.py", "overview.py"]
+
+@lru_cache(maxsize=None)
+def parser_version() -> str:
+    h = hashlib.sha256()
+    for name in _VERSIONED_MODULES:
+        h.update((Path(__file__).resolve().parent / name).read_bytes())
+    return h.hexdigest()[:16]
+
+class ParseCache:
+    """
+    Parsed overviews on disk, one compact JSON file per (PDF content, parser version).
+    Keys hash the PDF bytes, so a renamed or rewritten file is handled correctly, and
+    stale entries are never read again once the parser changes. A hit touches the file's
+    mtime, and writes evict the least recently used files beyond max_entries.
+    """
+
+    def __init__(self, path: str, max_entries: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+
+    def key(self, pdf_path: str) -> str:
+        h = hashlib.sha256(f"{parser_version()}:{PDF_TEXT_BACKEND}:".encode())
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        p = self._entry_path(key)
+        try:
+            with open(p, encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(p)
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def put(self, key: str, data: Dict) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        p = self._entry_path(key)
+        tmp = f"{p}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, p)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = [e for e in os.scandir(self.path) if e.name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(e.path)
+            except FileNotFoundError:
+                pass  # another process evicted it first
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+PARSE_CACHE = ParseCache(PARSE_CACHE_DIR, PARSE_CACHE_MAX_ENTRIES) if PARSE_CACHE_DIR else None
+
+def load_overview(pdf_filename: str, use_cache: bool = True, metrics: Optional[PlanMetrics] = None) -> Overview:
+    """
+    Parse a single company overview PDF into an Overview record.
+    With PLAN_PDF_BACKEND=auto the text backends are tried fastest first, keeping
+    the first result that has every MANDATORY_FIELDS value. Results are served from
+    PARSE_CACHE when the same PDF content was parsed before by this parser version.
+    """
+    metrics = metrics or PlanMetrics()
+    cache = PARSE_CACHE if use_cache else None
+    if cache is not None:
+        with metrics.span("parse_cache"):
+            key = cache.key(str(pdf_filename))
+            cached = cache.get(key)
+        if cached is not None:
+            metrics.count("parse_cache_hits")
+            return Overview.from_dict(cached)
+        metrics.count("parse_cache_misses")
+
+    backends = list(TEXT_BACKENDS) if PDF_TEXT_BACKEND == "auto" else [PDF_TEXT_BACKEND]
+    for i, backend in enumerate(backends):
+        if i:
+            metrics.count("retries")  # previous backend lost a mandatory field
+        with metrics.span("extract"):
+            raw_text = extract_text_from_pdf(str(pdf_filename), stop_when_complete=True, backend=backend,
+                                             metrics=metrics)
+        metrics.count("characters", len(raw_text))
+        with metrics.span("parse"):
+            overview = parse_overview(raw_text)
+        if not missing_mandatory_fields(overview):
+            break
+
+    if cache is not None:
+        with metrics.span("parse_cache"):
+            cache.put(key, overview.to_dict())
+    return overview
+
+def parse_single_pdf(pdf_filename: str, use_cache: bool = True) -> Dict:
+    """
+    Parse a single company overview PDF into a structured dict (load_overview().to_dict()).
+    """
+    return load_overview(pdf_filename, use_cache).to_dict()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Overview text parser: the text of a company overview PDF into an Overview record
+(parse_overview) or its plain dict layout (parse_overview_text). Pure Python with
+no third-party imports, so batch tools can parse extracted text cheaply.
+"""
+
+import re
+import sys
+from bisect import bisect_left
+from typing import Dict, List
+
+from .model import KPI, Budget, Deliverable, Milestone, Overview, Person, Risk
+
+# Helper Functions
+def _clean(s: str) -> str:
+    return re.sub(r"\s+", " ", s or "").strip()
+
+def _num(s: str) -> float:
+    if not s:
+        return 0.0
+    s = s.replace(",", "")
+    m = re.search(r"(\d+(?:\.\d+)?)", s)
+    return float(m.group(1)) if m else 0.0
+
+def _warn(message: str) -> None:
+    print(f"[parser] {message}", file=sys.stderr)
+
+def _trl(s: str, field: str):
+    """A TRL in 1..9, or None (with a warning) so one malformed overview still parses."""
+    v = int(s)
+    if 1 <= v <= 9:
+        return v
+    _warn(f"{field} {v} is outside 1-9; left empty")
+    return None
+
+def _split_semicolons(s: str) -> List[str]:
+    if not s:
+        return []
+    return [x.strip() for x in re.split(r";|\n", s) if x.strip()]
+
+def _bullet_lines(block: str) -> List[str]:
+    return [_clean(x) for x in re.findall(r"^- (.+)$", block or "", flags=re.M)]
+
+# Section index: every heading/label the field extractors anchor on (matched case-insensitively).
+_SECTION_TOKENS = [
+    ("title", "title:"),
+    ("product", "product:"),
+    ("summary", "summary:"),
+    ("problem", "problem statement"),
+    ("objective", "objective"),
+    ("key_outcomes", "key outcomes"),
+    ("timeline", "timeline"),
+    ("dates", "start"),
+    ("milestones", "milestones"),
+    ("budget", "budget"),
+    ("people", "people"),
+    ("currency", "currency:"),
+    ("total", "total:"),
+    ("capex", "capex:"),
+    ("opex", "opex:"),
+    ("contingency", "contingency:"),
+    ("funding", "funding:"),
+    ("sponsor", "sponsor:"),
+    ("lead", "project lead:"),
+    ("team", "team:"),
+    ("stakeholders", "stakeholders"),
+    ("partners", "partners"),
+    ("kpis", "kpis"),
+    ("risks", "risks"),
+    ("reporting", "reporting"),
+    ("trl", "trl"),
+]
+# Tokens that are not plain literals: the literal above finds candidates, this confirms them
+_TOKEN_GUARDS = {"dates": re.compile(r"start\s*date:", re.I)}
+# A blank line is a newline whose following whitespace run contains another newline
+_BLANK_LINE_RE = re.compile(r"\n(?=[^\S\n]*\n)")
+_WORD_CHAR_RE = re.compile(r"\w")
+_WS_RE = re.compile(r"\s*")
+
+_TITLE_RE = re.compile(r"^Title:\s*(.+)$", re.M | re.I)
+_PRODUCT_RE = re.compile(r"Product:\s*(.+)", re.I)
+_SUMMARY_RE = re.compile(r"Summary:\s*(.+)", re.I)
+_DATES_RE = re.compile(r"Start\s*Date:\s*([0-9\-\/]+)\s*\|\s*End\s*Date:\s*([0-9\-\/]+)", re.I)
+_CURRENCY_RE = re.compile(r"Currency:\s*([A-Z]{3})", re.I)
+_TOTAL_RE = re.compile(r"Total:\s*([\d,\.]+)", re.I)
+_CAPEX_RE = re.compile(r"Capex:\s*([\d,\.]+)", re.I)
+_OPEX_RE = re.compile(r"Opex:\s*([\d,\.]+)", re.I)
+_CONTINGENCY_RE = re.compile(r"Contingency:\s*([\d\.]+)\s*%", re.I)
+_FUNDING_RE = re.compile(r"Funding:\s*(.+)", re.I)
+_SPONSOR_RE = re.compile(r"Sponsor:\s*(.*?)\s*\((.*?)\)", re.I)
+_LEAD_RE = re.compile(r"Project Lead:\s*(.*?)\s*\((.*?)\)", re.I)
+_TRL_RE = re.compile(r"TRL\s*Start:\s*(\d+)\s*;\s*End:\s*(\d+)", re.I)
+
+class _SectionIndex:
+    """
+    Positions of every section heading and blank line in an overview, built once up
+    front with literal scans. Field extractors then only look at their own span
+    instead of each running a regex over the whole document.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts: Dict[str, List[int]] = {k: [] for k, _ in _SECTION_TOKENS}
+        self.ends: Dict[int, int] = {}
+        # positions where the heading is followed by a word boundary (usable as a terminator)
+        self.bounded: Dict[str, List[int]] = {k: [] for k, _ in _SECTION_TOKENS}
+        # where a non-MULTILINE `$` matches: before a trailing newline and at the very end
+        self.eos = [len(text) - 1, len(text)] if text.endswith("\n") else [len(text)]
+        self.blanks = [m.start() for m in _BLANK_LINE_RE.finditer(text)]
+        lower = text.lower()
+        if len(lower) != len(text):
+            lower = None  # lower() changed some character's length, so offsets would drift
+        for kind, token in _SECTION_TOKENS:
+            guard = _TOKEN_GUARDS.get(kind)
+            for pos, end in _occurrences(text, lower, token):
+                if guard:
+                    g = guard.match(text, pos)
+                    if not g:
+                        continue
+                    end = g.end()
+                self.starts[kind].append(pos)
+                self.ends[pos] = end
+                if end == len(text) or not _WORD_CHAR_RE.match(text, end):
+                    self.bounded[kind].append(pos)
+
+    def match(self, kind: str, pattern: "re.Pattern"):
+        """Equivalent of pattern.search(text), trying only positions where `kind` occurs."""
+        for pos in self.starts[kind]:
+            m = pattern.match(self.text, pos)
+            if m:
+                return m
+        return None
+
+    def block(self, heading: str, terminators: List[str], to_end: bool = False):
+        """
+        Body of `heading` up to the first blank line or terminator heading, i.e. the
+        capture of r"Heading\\s*(.+?)(?:\\n\\s*\\n|Term\\b...)" with re.I | re.S.
+        `to_end` also accepts end-of-text as a terminator (the `|$` alternative).
+        """
+        # Only the first occurrence matters: a later one starts further right, so it
+        # cannot find a terminator the first one missed.
+        if not self.starts[heading]:
+            return None
+        body_start = _WS_RE.match(self.text, self.ends[self.starts[heading][0]]).end()
+        lo = body_start + 1  # the lazy body takes at least one character
+        candidates = [_next_at_or_after(self.blanks, lo)]
+        candidates += [_next_at_or_after(self.bounded[k], lo) for k in terminators]
+        if to_end:
+            candidates.append(_next_at_or_after(self.eos, lo))
+        found = [c for c in candidates if c is not None]
+        return self.text[body_start:min(found)] if found else None
+
+def _occurrences(text: str, lower, token: str):
+    """(start, end) of every case-insensitive occurrence of a lowercase literal, overlaps included."""
+    if lower is None:
+        for m in re.finditer(f"(?=({re.escape(token)}))", text, re.I):
+            yield m.start(), m.end(1)
+        return
+    i = lower.find(token)
+    while i != -1:
+        yield i, i + len(token)
+        i = lower.find(token, i + 1)
+
+def _next_at_or_after(positions: List[int], lo: int):
+    i = bisect_left(positions, lo)
+    return positions[i] if i < len(positions) else None
+
+def parse_overview_text(text: str) -> Dict:
+    """
+    Parse a project overview plan's text into a structured data_dict.
+    """
+    return parse_overview(text).to_dict()
+
+def parse_overview(text: str) -> Overview:
+    """
+    Parse a project overview plan's text into an Overview record.
+    """
+    t = text.replace("\r", "")
+    idx = _SectionIndex(t)
+    data = {}
+
+    # Title & (heuristic) company
+    m = idx.match("title", _TITLE_RE)
+    if m:
+        data["project_title"] = _clean(m.group(1))
+        # Heuristic: "<Company> — <Project>" or "<Company> - <Project>"
+        if "—" in data["project_title"]:
+            data["company_name"] = _clean(data["project_title"].split("—")[0])
+        elif " - " in data["project_title"]:
+            data["company_name"] = _clean(data["project_title"].split(" - ")[0])
+
+    # Product & Summary
+    m = idx.match("product", _PRODUCT_RE)
+    if m:
+        data["product_name"] = _clean(m.group(1))
+    m = idx.match("summary", _SUMMARY_RE)
+    if m:
+        data["product_summary"] = _clean(m.group(1))
+
+    # Problem Statement
+    block = idx.block("problem", ["objective"])
+    if block is not None:
+        data["problem_statement"] = _clean(block)
+
+    # Objective
+    block = idx.block("objective", ["key_outcomes"])
+    if block is not None:
+        data["objective"] = _clean(block)
+
+    # Key Outcomes
+    block = idx.block("key_outcomes", ["timeline"])
+    if block is not None:
+        data["key_outcomes"] = tuple(_bullet_lines(block))
+
+    # Timeline dates
+    m = idx.match("dates", _DATES_RE)
+    if m:
+        data["start_date"], data["end_date"] = m.group(1), m.group(2)
+
+    # Milestones block
+    block = idx.block("milestones", ["budget", "people"])
+    if block is not None:
+        milestones = []
+        for line in _bullet_lines(block):
+            # "Name (YYYY-MM-DD, Owner: Role)"
+            m2 = re.match(r"(.*?)\s*\((\d{4}-\d{2}-\d{2}),\s*Owner:\s*(.*?)\)\s*$", line)
+            if m2:
+                milestones.append(Milestone(_clean(m2.group(1)), m2.group(2), _clean(m2.group(3))))
+            else:
+                milestones.append(Milestone(line))
+        data["milestones"] = tuple(milestones)
+
+    # Budget block
+    budget = {}
+    cur = idx.match("currency", _CURRENCY_RE)
+    tot = idx.match("total", _TOTAL_RE)
+    cap = idx.match("capex", _CAPEX_RE)
+    opx = idx.match("opex", _OPEX_RE)
+    cont = idx.match("contingency", _CONTINGENCY_RE)
+    fund = idx.match("funding", _FUNDING_RE)
+    if cur:
+        budget["currency"] = cur.group(1).upper()
+    if tot:
+        budget["total"] = _num(tot.group(1))
+    if cap:
+        budget["capex"] = _num(cap.group(1))
+    if opx:
+        budget["opex"] = _num(opx.group(1))
+    if cont:
+        try:
+            budget["contingency_percent"] = float(cont.group(1))
+        except ValueError:
+            _warn(f"contingency {cont.group(1)!r} is not a number; left empty")
+    if fund:
+        budget["funding_sources"] = tuple(x for x in re.split(r";|,", fund.group(1)) if x.strip())
+    data["budget"] = Budget(**budget)
+
+    # People
+    s = idx.match("sponsor", _SPONSOR_RE)
+    if s:
+        data["sponsor"] = Person(_clean(s.group(1)), _clean(s.group(2)))
+    l = idx.match("lead", _LEAD_RE)
+    if l:
+        data["lead"] = Person(_clean(l.group(1)), _clean(l.group(2)))
+    team_block = idx.block("team", ["stakeholders"])
+    if team_block is not None:
+        team = []
+        members = [x.strip() for x in team_block.split(";") if x.strip()]
+        for mbr in members:
+            mm = re.match(r"(.*?)\s*\((.*?)\)", mbr)
+            if mm:
+                team.append(Person(_clean(mm.group(1)), _clean(mm.group(2))))
+            else:
+                team.append(Person(_clean(mbr)))
+        data["team"] = tuple(team)
+
+    # Stakeholders
+    stk = idx.block("stakeholders", ["partners"])
+    if stk is not None:
+        data["stakeholders"] = tuple(_split_semicolons(stk))
+
+    # Partners
+    prt = idx.block("partners", ["kpis"])
+    if prt is not None:
+        data["partners"] = tuple(_split_semicolons(prt))
+
+    # KPIs
+    kpi_block = idx.block("kpis", ["risks"])
+    if kpi_block is not None:
+        kpis = []
+        for line in _bullet_lines(kpi_block):
+            name = _clean(re.split(r"—|-", line)[0])
+            target = ""
+            measure = ""
+            m1 = re.search(r"Target:\s*([^—-]+)", line)
+            m2 = re.search(r"Measure:\s*(.+)$", line)
+            if m1:
+                target = _clean(m1.group(1))
+            if m2:
+                measure = _clean(m2.group(1))
+            kpis.append(KPI(name, target, measure))
+        data["kpis"] = tuple(kpis)
+
+    # Risks
+    risk_block = idx.block("risks", ["reporting"])
+    if risk_block is not None:
+        risks = []
+        for line in _bullet_lines(risk_block):
+            rid = ""
+            desc = line
+            like = impact = owner = mitigation = ""
+            m_id = re.match(r"(R\d+):\s*(.*)", line)
+            if m_id:
+                rid, desc = m_id.group(1), m_id.group(2)
+            m_meta = re.search(r"\(Likelihood:\s*(.*?),\s*Impact:\s*(.*?),\s*Owner:\s*(.*?)\)", desc)
+            if m_meta:
+                like, impact, owner = _clean(m_meta.group(1)), _clean(m_meta.group(2)), _clean(m_meta.group(3))
+                desc = _clean(re.sub(r"\(Likelihood:.*?\)", "", desc))
+            m_mit = re.search(r"—\s*Mitigation:\s*(.+)$", line)
+            if m_mit:
+                mitigation = _clean(m_mit.group(1))
+            risks.append(Risk(rid or f"R{len(risks)+1}", _clean(desc), like, impact, owner, mitigation))
+        data["risks"] = tuple(risks)
+
+    # Reporting
+    rep_block = idx.block("reporting", ["trl"], to_end=True)
+    if rep_block is not None:
+        data["reporting"] = tuple(
+            Deliverable(_clean(name), due)
+            for name, due in re.findall(r"^- (.+?)\s*—\s*due\s*([0-9\-\/]+)", rep_block, flags=re.I | re.M)
+        )
+
+    # TRL
+    m = idx.match("trl", _TRL_RE)
+    if m:
+        data["trl_start"] = _trl(m.group(1), "trl_start")
+        data["trl_end"] = _trl(m.group(2), "trl_end")
+
+    # Values the records would reject were dropped above, so a malformed overview still parses
+    return Overview(**data)
+
+class OverviewTextAccumulator:
+    """
+    Incrementally collects page texts and reports when the overview is complete, i.e.
+    the TRL line has been seen. Only the tail of the previous page is rescanned, so
+    a TRL line split across a page break is still detected.
+    """
+
+    _TAIL = 64
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.pages = 0
+        self.complete = False
+        self._tail = ""
+
+    def feed(self, page_text: str) -> bool:
+        self.chunks.append(page_text)
+        self.pages += 1
+        if not self.complete:
+            window = self._tail + ("\n" if self.pages > 1 else "") + page_text
+            self.complete = _TRL_RE.search(window.replace("\r", "")) is not None
+            self._tail = window[-self._TAIL:]
+        return self.complete
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.chunks)
+
+# Fields the plan cannot be generated without; a backend whose text loses any of them is rejected
+MANDATORY_FIELDS = ["product_name", "start_date", "end_date", "budget.currency", "budget.total"]
+
+def missing_mandatory_fields(data) -> List[str]:
+    """MANDATORY_FIELDS absent from an Overview (or its to_dict form)."""
+    missing = []
+    for field in MANDATORY_FIELDS:
+        value = data
+        for key in field.split("."):
+            value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+        if not value:
+            missing.append(field)
+    return missing
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF text extraction: page text from the pdfminer-based "raw" backend or pdfplumber,
+serially or in parallel page ranges, stopping once the overview is complete.
+pdfplumber is imported only when its backend is used.
+"""
+
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+from .metrics import PlanMetrics
+from .parser import OverviewTextAccumulator
+
+# Below this many pages, process start-up costs more than parallel layout analysis saves
+PARALLEL_MIN_PAGES = int(os.getenv("PLAN_PDF_PARALLEL_MIN_PAGES", "24"))
+
+# ---- Text extraction backends ----
+class _RawTextDevice(PDFTextDevice):
+    """
+    pdfminer device that writes characters straight into lines in content-stream
+    order, skipping the per-character layout objects pdfplumber builds. Lines break
+    when the baseline moves and words split on horizontal gaps, with the same 3pt
+    tolerances pdfplumber's extract_text uses.
+    """
+
+    _TOLERANCE = 3.0
+
+    def __init__(self, rsrcmgr: PDFResourceManager):
+        super().__init__(rsrcmgr)
+        self.begin_page(None, None)
+
+    def begin_page(self, page, ctm):
+        self.ctm = ctm
+        self._lines: List[str] = []
+        self._line: List[str] = []
+        self._y = None
+        self._x1 = 0.0
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate) -> float:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = "(cid:%d)" % cid
+        adv = font.char_width(cid) * fontsize * scaling
+        a, _, _, _, e, f = matrix
+        if self._y is None or abs(f - self._y) > self._TOLERANCE:
+            self._end_line()
+            self._y = f
+        elif e > self._x1 + self._TOLERANCE:
+            self._line.append(" ")
+        self._line.append(text)
+        self._x1 = e + a * adv
+        return adv
+
+    def _end_line(self):
+        line = " ".join("".join(self._line).split())
+        if line:
+            self._lines.append(line)
+        self._line = []
+
+    def page_text(self) -> str:
+        self._end_line()
+        return "\n".join(self._lines)
+
+def _iter_raw_page_texts(path: str, first: int = 1, last: int = None) -> Iterator[str]:
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = _RawTextDevice(rsrcmgr)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    pagenos = set(range(first - 1, last)) if last is not None else None
+    with open(path, "rb") as fp:
+        for i, page in enumerate(PDFPage.get_pages(fp, pagenos=pagenos, maxpages=last or 0)):
+            if pagenos is None and i < first - 1:
+                continue
+            interpreter.process_page(page)
+            yield device.page_text()
+
+def _iter_pdfplumber_page_texts(path: str, first: int = 1, last: int = None) -> Iterator[str]:
+    import pdfplumber
+
+    pages = list(range(first, last + 1)) if last is not None else None
+    with pdfplumber.open(path, pages=pages) as pdf:
+        for p in pdf.pages:
+            if p.page_number < first:
+                continue
+            t = p.extract_text() or ""
+            p.flush_cache()
+            yield t
+
+# Fastest first: parse_single_pdf tries them in this order until one yields a usable overview
+TEXT_BACKENDS = {
+    "raw": _iter_raw_page_texts,
+    "pdfplumber": _iter_pdfplumber_page_texts,
+}
+# "auto", or a TEXT_BACKENDS name to always use that backend
+PDF_TEXT_BACKEND = os.getenv("PLAN_PDF_BACKEND", "auto")
+
+def iter_pdf_page_texts(path: str, first: int = 1, last: int = None, backend: str = "pdfplumber") -> Iterator[str]:
+    """
+    Yield the text of pages first..last (1-based, inclusive) in order, releasing each
+    page's layout objects before moving on.
+    """
+    return TEXT_BACKENDS[backend](path, first, last)
+
+def _extract_page_range(path: str, first: int, last: int, backend: str) -> List[str]:
+    # Runs in a worker process: each worker opens the PDF itself
+    return list(iter_pdf_page_texts(path, first, last, backend))
+
+def _iter_pdf_page_texts_parallel(path: str, first: int, last: int, workers: int, backend: str) -> Iterator[str]:
+    """Extract page ranges of first..last in a process pool and yield page texts in document order."""
+    # Several ranges per worker keeps the pool busy; only `workers` ranges are in flight
+    # at a time so stopping early does not leave the rest of the document queued.
+    chunk = max(1, math.ceil((last - first + 1) / (workers * 4)))
+    ranges = [(lo, min(lo + chunk - 1, last)) for lo in range(first, last + 1, chunk)]
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = [pool.submit(_extract_page_range, path, lo, hi, backend) for lo, hi in ranges[:workers]]
+        for i in range(len(ranges)):
+            texts = in_flight.pop(0).result()
+            if i + workers < len(ranges):
+                in_flight.append(pool.submit(_extract_page_range, path, *ranges[i + workers], backend))
+            yield from texts
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def pdf_page_count(path: str) -> int:
+    """Page count from the document catalog, without laying out any page or importing pdfplumber."""
+    with open(path, "rb") as fp:
+        doc = PDFDocument(PDFParser(fp))
+        pages = resolve1(doc.catalog.get("Pages"))
+        count = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+        if isinstance(count, int):
+            return count
+        return sum(1 for _ in PDFPage.create_pages(doc))
+
+def extract_text_from_pdf(
+    path: str, stop_when_complete: bool = False, workers: int = None, backend: str = "pdfplumber",
+    metrics: Optional[PlanMetrics] = None,
+) -> str:
+    """
+    Return concatenated text from the pages of a PDF.
+    With stop_when_complete, extraction stops at the page holding the TRL line (the
+    last section parse_overview_text reads), so trailing appendices are never laid out.
+    `workers` > 1 extracts page ranges in parallel processes. By default that is only
+    done for PDFs of at least PARALLEL_MIN_PAGES pages, and when stopping early the
+    first PARALLEL_MIN_PAGES pages are read serially before the page count is even
+    looked up: the overview is usually complete before a pool would have started.
+    `backend` names one of TEXT_BACKENDS. Pages read are added to metrics["pages"].
+    """
+    auto = workers is None
+    if auto:
+        workers = (os.cpu_count() or 1) if PARALLEL_MIN_PAGES > 0 else 1
+    acc = OverviewTextAccumulator()
+
+    def stages():
+        if workers <= 1:
+            yield iter_pdf_page_texts(path, backend=backend)
+            return
+        head = 0
+        if auto and stop_when_complete:
+            head = PARALLEL_MIN_PAGES
+            yield iter_pdf_page_texts(path, 1, head, backend)
+            if acc.pages < head:
+                return  # the document ended within the serial head
+        n_pages = pdf_page_count(path)
+        if auto and not stop_when_complete and n_pages < PARALLEL_MIN_PAGES:
+            yield iter_pdf_page_texts(path, backend=backend)
+        elif head < n_pages:
+            yield _iter_pdf_page_texts_parallel(path, head + 1, n_pages, workers, backend)
+
+    done = False
+    for pages in stages():
+        try:
+            for t in pages:
+                if acc.feed(t) and stop_when_complete:
+                    done = True
+                    break
+        finally:
+            pages.close()  # closes the PDF (and the worker pool) even when we stop early
+        if done:
+            break
+    if metrics is not None:
+        metrics.count("pages", acc.pages)
+    return acc.text
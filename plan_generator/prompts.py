@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Model prompts: the section list, the system prompt, and compact per-request prompts
+covering only the sections being generated.
+"""
+
+import re
+import json
+import math
+from collections import deque
+
+from .tables import TABLE_SECTIONS
+
+TEMPLATE_SECTIONS = """
+Sections to produce (JSON keys):
+- aim_text
+- objective_text
+- scope_text
+- implementation_text
+- governance_text
+- partner_org
+- project_budget
+- payment_schedule
+- miles_outcomes
+- reporting
+- comms_text
+- evaluation_text
+- pir_text
+"""
+
+SYSTEM_PROMPT = """You write professional project plans using the json structure of a company's project overview.
+- Expand bullets into concise, businesslike paragraphs which are 200-300 words for each section in output.
+- If content(percentages, numbers, dates,detailed description) exists but is less than desired word limit, invent more using descriptions for each section in TEMPLATE_SECTIONS
+- If content in json structure is enough to write 200-300 words, then do not invent more content.
+- 'aim_text' description is Write 1–2 plain-English sentences explaining why the project is
+being undertaken, its high-level aim, and how it aligns with the organisation’s strategic direction.
+Include the starting and finishing TRLs from the grant application.
+- 'objective_text' should describe how your project will be measured. State 4-5 objective(s) which will stem
+from implementation of the project.
+- 'scope_text'  should Define the project’s scope clearly, stating inclusions and exclusions. Keep
+ it concise to guide work plans, budgets, schedules, and expectations.
+- if partner_org is missing then write "TBD"
+- 'project_budget' should be detailed and in tabular format. you are allowed to invent if there are less than 5 rows and columns.
+- 'payment_schedule' should be detailed and in tabular format.
+- For 'miles_outcomes', List project milestones and deliverables with their phase, outcomes, dates, and
+ success measures. Use the columns: Milestone, Project Phase, Outcomes, Start Date, End Date, Measure of Success.
+If the input JSON provides full data for 5 rows, use it; otherwise, create the missing entries.
+- Columns for generating table for 'reporting' are deliverables, description and due dates.Example row
+entries for deliverables are progress report, evaluation report and final report.
+- Show outcomes/results with their success measures in a two-column table. Use items like TRL improvement, IP agreements, industry engagement, commercial readiness, or spinouts. If fewer than 5 rows exist in the JSON, add data to make 5.
+- Final 'evaluation_text' is generated in tabular format with first column as outcomes/results
+and second column is the measure of success(Improving the TRL of the project,Australia’s Economic Accelerator,Increased industry engagement through collaboration, investment, product development
+Securing IP, Licensing or Patent agreements for the research). invent data if the json structure gives less than 5 rows.
+- DO NOT invent or modify numbers, dates, currencies, percentages or milestone due dates.
+- Keep tone neutral and clear.
+
+"""
+
+SECTION_KEYS = [
+    "aim_text", "objective_text", "scope_text", "implementation_text", "governance_text",
+    "partner_org", "project_budget", "payment_schedule", "miles_outcomes", "reporting",
+    "comms_text", "evaluation_text", "pir_text",
+]
+# Sections written by the model; TABLE_SECTIONS are computed from the overview
+NARRATIVE_KEYS = [k for k in SECTION_KEYS if k not in TABLE_SECTIONS]
+CHARS_PER_TOKEN = 4             # rough average for Gemini tokenisers on English/JSON
+OUTPUT_TOKENS_PER_SECTION = 400  # ~250 words (or a table) per section
+# Instructions that refer to a section without naming its key
+SECTION_ALIASES = {"evaluation_text": ["outcomes/results"]}
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def compact_canonical(value):
+    """
+    Drop what carries no information: None, empty strings/lists/dicts and the parser's
+    0 / 0.0 "not found" numbers. Every populated field is kept unchanged.
+    """
+    if isinstance(value, dict):
+        items = ((k, compact_canonical(v)) for k, v in value.items())
+        return {k: v for k, v in items if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [v for v in (compact_canonical(x) for x in value) if v not in (None, "", [], {})]
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value == 0:
+        return None
+    return value
+
+def _instruction_items(prompt):
+    """SYSTEM_PROMPT as (text, section keys mentioned) items: the intro plus one per '- ' bullet."""
+    items, current = [], []
+    for line in prompt.strip().splitlines():
+        if line.startswith("- ") and current:
+            items.append(" ".join(current))
+            current = []
+        if line.strip():
+            current.append(line.strip())
+    if current:
+        items.append(" ".join(current))
+    def mentions(text):
+        lowered = text.lower()
+        return {k for k in SECTION_KEYS
+                if re.search(rf"\b{k}\b", text) or any(a in lowered for a in SECTION_ALIASES.get(k, []))}
+    return [(" ".join(t.split()), mentions(t)) for t in items]
+
+def compact_system_prompt(keys=SECTION_KEYS):
+    """
+    SYSTEM_PROMPT with wrapped lines joined, repeated instructions removed, and
+    section-specific bullets kept only for the sections being requested.
+    """
+    seen, kept = set(), []
+    for text, mentions in _instruction_items(SYSTEM_PROMPT):
+        norm = text.lower()
+        if norm in seen or (mentions and not mentions & set(keys)):
+            continue
+        seen.add(norm)
+        kept.append(text)
+    return "\n".join(kept)
+
+def build_prompt(canonical, keys=SECTION_KEYS):
+    """
+    (system_prompt, user_prompt, stats) for one request covering `keys`. The data is
+    compact JSON without empty fields, and TEMPLATE_SECTIONS is not repeated since
+    the reply skeleton already names every key.
+    """
+    system_prompt = compact_system_prompt(keys)
+    skeleton = json.dumps({k: "..." for k in keys}, separators=(",", ":"))
+    data = json.dumps(compact_canonical(canonical), separators=(",", ":"), ensure_ascii=False)
+    user_prompt = f"""Canonical project data (immutable values):
+{data}
+
+Return STRICT JSON with exactly these keys:
+{skeleton}
+"""
+    stats = {
+        "sections": len(keys),
+        "input_tokens_est": estimate_tokens(system_prompt) + estimate_tokens(user_prompt),
+        "output_tokens_est": OUTPUT_TOKENS_PER_SECTION * len(keys),
+    }
+    return system_prompt, user_prompt, stats
+
+# Stats of the most recent model requests; bounded, since the service process is long-lived
+TOKEN_LOG_SIZE = 256
+token_log = deque(maxlen=TOKEN_LOG_SIZE)
+
+def record_usage(stats, prompt_tokens=None, output_tokens=None):
+    """Attach the model's reported token counts (when available) and log the request."""
+    if prompt_tokens is not None:
+        stats["input_tokens"] = prompt_tokens
+    if output_tokens is not None:
+        stats["output_tokens"] = output_tokens
+    token_log.append(stats)
+    return stats
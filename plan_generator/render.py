@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Plan rendering: one shared Jinja environment (templates compiled once per process,
+bytecode reused across runs) and per-section fragments of the plan template, each
+cached under a hash of the context values its {% block %} reads. Regenerating or
+editing one section re-renders only the blocks that read it, and sections that are
+identical across a batch (certification, TBD placeholders, ...) render once.
+jinja2 is imported when the first environment is built.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+from .model import to_jsonable
+
+PLAN_TEMPLATE = "project_plan.md.j2"
+# The package templates, then any PLAN_TEMPLATE_DIRS (os.pathsep separated) for local overrides
+TEMPLATE_DIRS = [str(Path(__file__).resolve().parent / "templates")] + \
+    [d for d in os.getenv("PLAN_TEMPLATE_DIRS", "").split(os.pathsep) if d]
+JINJA_CACHE_DIR = Path(os.getenv("PLAN_JINJA_CACHE_DIR", "cache/jinja"))
+FRAGMENT_CACHE_MAX = int(os.getenv("PLAN_FRAGMENT_CACHE_MAX", "4096"))
+
+
+@lru_cache(maxsize=None)
+def plan_env():
+    """The Environment every render uses; templates are looked up by name."""
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIRS),
+        bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+    )
+
+
+class FragmentRenderer:
+    """Renders a template block by block, with an LRU cache of rendered fragments."""
+
+    def __init__(self, env, template_name, max_entries=FRAGMENT_CACHE_MAX):
+        from jinja2 import meta, nodes
+
+        self.template = env.get_template(template_name)
+        source = env.loader.get_source(env, template_name)[0]
+        ast = env.parse(source)
+        # Template and imported macro sources are part of every key, so edits invalidate fragments
+        version = hashlib.sha256(source.encode("utf-8"))
+        for name in sorted(n for n in meta.find_referenced_templates(ast) if n):
+            version.update(env.loader.get_source(env, name)[0].encode("utf-8"))
+        self.version = version.hexdigest()
+        # block name -> names it reads; loop variables etc. drop out since they are not in the context
+        self.sections = {b.name: sorted({n.name for n in b.find_all(nodes.Name) if n.ctx == "load"})
+                         for b in ast.find_all(nodes.Block)}
+        self.max_entries = max_entries
+        self.fragments = OrderedDict()
+        self.hits = self.misses = 0
+
+    def key(self, section, context):
+        inputs = {k: context[k] for k in self.sections[section] if k in context}
+        payload = json.dumps(to_jsonable(inputs), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(f"{self.version}:{section}:{payload}".encode("utf-8")).hexdigest()
+
+    def render_section(self, section, context):
+        key = self.key(section, context)
+        fragment = self.fragments.get(key)
+        if fragment is not None:
+            self.fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+        self.misses += 1
+        fragment = "".join(self.template.blocks[section](self.template.new_context(context)))
+        self.fragments[key] = fragment
+        if len(self.fragments) > self.max_entries:
+            self.fragments.popitem(last=False)
+        return fragment
+
+    def iter_fragments(self, context):
+        """Section fragments in document order; joined they equal template.render(**context)."""
+        for section in self.sections:
+            yield self.render_section(section, context)
+
+    def render(self, context):
+        return "".join(self.iter_fragments(context))
+
+
+@lru_cache(maxsize=None)
+def fragment_renderer(template_name=PLAN_TEMPLATE):
+    return FragmentRenderer(plan_env(), template_name)
+
+
+def render_plan_to_file(context, out_path, template_name=PLAN_TEMPLATE):
+    """Write the plan to out_path fragment by fragment, reusing cached section fragments."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.writelines(fragment_renderer(template_name).iter_fragments(context))
+    return out_path
+
+
+def render_plans(contexts, out_dir="output", template_name=PLAN_TEMPLATE):
+    """Render {name: context} to <out_dir>/<name>_plan.md; fragments shared between plans render once."""
+    return [render_plan_to_file(ctx, Path(out_dir) / f"{name}_plan.md", template_name)
+            for name, ctx in contexts.items()]
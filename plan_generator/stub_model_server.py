@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the Gemini generateContent REST endpoint, for exercising plan
+generation without an API key. Replies with the JSON keys the prompt asks for
+("Return STRICT JSON with exactly these keys: {...}"), after an optional delay,
+and can randomly fail or drop keys to exercise retries. aim_text carries the TRLs
+from the prompt's canonical data, so stub plans pass the frozen-value guardrail.
+
+Usage: python3 stub_model_server.py [--port 8765] [--delay 0.5] [--fail-rate 0.1]
+then   GEMINI_API_BASE=http://127.0.0.1:8765/v1beta
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_KEYS_BLOCK_RE = re.compile(r"exactly these keys:\s*\{(.*?)\}", re.S)
+_KEY_RE = re.compile(r'"(\w+)"\s*:')
+_DATA_RE = re.compile(r"Canonical project data \(immutable values\):\s*(\{.*?\})\s*\n\s*Return STRICT JSON", re.S)
+
+
+def requested_keys(prompt: str):
+    m = _KEYS_BLOCK_RE.search(prompt)
+    return _KEY_RE.findall(m.group(1)) if m else []
+
+
+def canonical_data(prompt: str) -> dict:
+    m = _DATA_RE.search(prompt)
+    try:
+        return json.loads(m.group(1)) if m else {}
+    except ValueError:
+        return {}
+
+
+def stub_section(key: str, data: dict = None) -> str:
+    text = f"[stub] {key.replace('_', ' ')}"
+    trls = [f"TRL {(data or {})[f]}" for f in ("trl_start", "trl_end") if (data or {}).get(f) is not None]
+    if key == "aim_text" and trls:
+        text += f" from {' to '.join(trls)}"
+    return text
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_rate = 0.0
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "failed": 0}
+    _lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        try:
+            time.sleep(self.delay)
+            prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+            keys = requested_keys(prompt)
+            roll = random.random()
+            if roll < self.fail_rate / 2:
+                self._count_failure()
+                return self._reply(500, {"error": {"code": 500, "message": "stub failure"}})
+            if roll < self.fail_rate and len(keys) > 1:
+                self._count_failure()
+                keys = keys[:-1]  # a reply that silently drops a section
+            data = canonical_data(prompt)
+            text = json.dumps({k: stub_section(k, data) for k in keys})
+            self._reply(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]})
+        finally:
+            with self._lock:
+                self.stats["in_flight"] -= 1
+
+    def do_GET(self):
+        # /stats: request counters, e.g. to check a concurrency cap was respected
+        with self._lock:
+            self._reply(200, dict(self.stats))
+
+    def _count_failure(self):
+        with self._lock:
+            self.stats["failed"] += 1
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int = 8765, delay: float = 0.0, fail_rate: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stub on a background thread and return the server (call .shutdown() to stop)."""
+    StubModelHandler.delay = delay
+    StubModelHandler.fail_rate = fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubModelHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local stub of the Gemini generateContent endpoint.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay", type=float, default=0.5, help="seconds per reply")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="fraction of replies that fail or drop a key")
+    args = ap.parse_args()
+    server = serve(args.port, args.delay, args.fail_rate)
+    print(f"GEMINI_API_BASE=http://127.0.0.1:{server.server_port}/v1beta")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Table engine: the plan sections that are pure functions of the parsed overview
+(budget split, payment schedule, milestone table, reporting calendar), computed
+locally instead of generated by the LLM. Figures and dates are copied from the
+Overview, never rephrased, so these sections cannot drift from the source.
+Blocks have the same shapes the LLM was asked for, so the context mapper and
+template handle them unchanged.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from .model import Overview
+from .parser import _clean
+
+# Sections built here; only the remaining (narrative) sections go to the LLM
+TABLE_SECTIONS = ["project_budget", "payment_schedule", "miles_outcomes", "reporting"]
+
+MILESTONE_COLUMNS = ["Milestone", "Owner", "Start Date", "End Date"]
+
+
+def _date(s: str) -> Optional[date]:
+    try:
+        return date.fromisoformat((s or "").replace("/", "-"))
+    except ValueError:
+        return None
+
+
+def _split_cents(total: float, weights: List[float]) -> List[float]:
+    """Split total into len(weights) amounts proportional to weights, summing exactly to total."""
+    cents = round(total * 100)
+    if sum(weights) <= 0:
+        weights = [1.0] * len(weights)
+    scale = sum(weights)
+    parts = [int(cents * w // scale) for w in weights]
+    parts[-1] += cents - sum(parts)  # rounding remainder goes on the final tranche
+    return [p / 100 for p in parts]
+
+
+def _milestone_periods(ov: Overview) -> List[tuple]:
+    """(start, end) ISO dates per milestone: from the previous milestone (or project start) to its due date."""
+    periods, start = [], ov.start_date
+    for m in ov.milestones:
+        periods.append((start, m.due))
+        due = _date(m.due)
+        start = (due + timedelta(days=1)).isoformat() if due else ""
+    return periods
+
+
+def budget_table(ov: Overview) -> Dict:
+    """Budget summary plus the capex / opex / contingency split."""
+    b = ov.budget
+    breakdown = []
+    if b.capex:
+        breakdown.append({"category": "Capital expenditure (capex)", "amount": b.capex})
+    if b.opex:
+        breakdown.append({"category": "Operating expenditure (opex)", "amount": b.opex})
+    if b.contingency_percent and b.total:
+        breakdown.append({
+            "category": f"Contingency reserve ({b.contingency_percent:g}% of total)",
+            "amount": round(b.total * b.contingency_percent / 100, 2),
+        })
+    return {
+        "currency": b.currency,
+        "total": b.total,
+        "capex": b.capex,
+        "opex": b.opex,
+        "contingency_percent": b.contingency_percent,
+        "funding_sources": [_clean(s) for s in b.funding_sources],
+        "breakdown": breakdown,
+    }
+
+
+def payment_schedule_table(ov: Overview) -> Dict:
+    """
+    One tranche per milestone, due on the milestone date. The total is split in
+    proportion to each milestone's share of the timeline (equal tranches when dates
+    are missing); with no milestones the whole amount is due at the project end.
+    """
+    b = ov.budget
+    if not b.total:
+        return {"currency": b.currency, "payments": []}
+    if not ov.milestones:
+        return {"currency": b.currency,
+                "payments": [{"milestone": "Project completion", "amount": b.total, "due_date": ov.end_date}]}
+    weights = []
+    for start, end in _milestone_periods(ov):
+        s, e = _date(start), _date(end)
+        weights.append(float((e - s).days + 1) if s and e and e >= s else 0.0)
+    if 0.0 in weights:
+        weights = [1.0] * len(weights)
+    amounts = _split_cents(b.total, weights)
+    payments = []
+    for i, (m, amount) in enumerate(zip(ov.milestones, amounts)):
+        due = m.due or (ov.end_date if i == len(ov.milestones) - 1 else "")
+        payments.append({"milestone": m.name, "amount": amount, "due_date": due})
+    return {"currency": b.currency, "payments": payments}
+
+
+def milestones_table(ov: Overview) -> Dict:
+    """Milestone, owner and the period leading up to each due date."""
+    rows = [[m.name, m.owner, start, end] for m, (start, end) in zip(ov.milestones, _milestone_periods(ov))]
+    return {"columns": list(MILESTONE_COLUMNS), "rows": rows}
+
+
+def reporting_table(ov: Overview) -> Dict:
+    """
+    Reporting calendar: the overview's deliverables in due-date order, each covering
+    the period since the previous one. Without any, a final report at the project end.
+    """
+    items = [(d.name, d.due) for d in ov.reporting]
+    if not items and ov.end_date:
+        items = [("Final report", ov.end_date)]
+    items.sort(key=lambda x: (_date(x[1]) is None, x[1]))
+    deliverables, prev = [], ov.start_date
+    for name, due in items:
+        desc = f"Covers {prev} to {due}" if prev and due else ""
+        deliverables.append({"name": name, "description": desc, "due_date": due})
+        if _date(due):
+            prev = (_date(due) + timedelta(days=1)).isoformat()
+    return {"deliverables": deliverables}
+
+
+def plan_tables(ov: Overview) -> Dict:
+    """All TABLE_SECTIONS blocks for an overview."""
+    return {
+        "project_budget": budget_table(ov),
+        "payment_schedule": payment_schedule_table(ov),
+        "miles_outcomes": milestones_table(ov),
+        "reporting": reporting_table(ov),
+    }
@@ -1,8 +1,10 @@
 import os
-from flask import Flask, render_template, request
+from flask import Flask, jsonify, render_template, request
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from result_cache import ResultCache, cache_key, prompt_version
+
 # --- Load API key from .env ---
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
@@ -15,11 +17,9 @@ genai.configure(api_key=api_key)
 # --- Flask App Setup ---
 app = Flask(__name__)
 
-# --- Function to generate startup simulation ---
-def generate_startup_simulation(startup_name, action_or_test, context, audience):
-    model = genai.GenerativeModel("gemini-1.5-flash-latest")
-
-    prompt = f"""
+# --- Simulation results, shared with generate.py's cache directory ---
+MODEL_NAME = "gemini-1.5-flash-latest"
+PROMPT_TEMPLATE = """
     You are a virtual startup simulator. Your task is to predict and describe
     what will happen if a specific action or test is performed by a startup.
 
@@ -43,12 +43,28 @@ def generate_startup_simulation(startup_name, action_or_test, context, audience)
     Potential Risks:
     Recommendations:
     """
+PROMPT_VERSION = prompt_version(PROMPT_TEMPLATE)
+result_cache = ResultCache()
 
+# --- Function to generate startup simulation ---
+def generate_startup_simulation(startup_name, action_or_test, context, audience):
+    inputs = {"startupName": startup_name, "actionTest": action_or_test,
+              "context": context, "targetAudience": audience}
+    key = cache_key(MODEL_NAME, PROMPT_VERSION, inputs)
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached
+
+    model = genai.GenerativeModel(MODEL_NAME)
+    prompt = PROMPT_TEMPLATE.format(startup_name=startup_name, action_or_test=action_or_test,
+                                    context=context, audience=audience)
     try:
         response = model.generate_content(prompt)
-        return response.text
+        text = response.text
     except Exception as e:
         return f"Error generating content: {str(e)}"
+    result_cache.put(key, text)  # errors above are not cached
+    return text
 
 # --- Routes ---
 @app.route("/", methods=["GET", "POST"])
@@ -62,6 +78,10 @@ def home():
         output = generate_startup_simulation(startup_name, action_or_test, context, audience)
     return render_template("index.html", output=output)
 
+@app.route("/cache-stats")
+def cache_stats():
+    return jsonify(result_cache.stats())
+
 # --- Run App ---
 if __name__ == "__main__":
     app.run(debug=True)
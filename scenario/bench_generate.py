@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exercise generate.py against a local fake Gemini endpoint: keep-alive reuse, retries
+on 429/5xx, read timeouts, coalescing of identical concurrent simulations (one
+generate.py process each, as server/index.js runs them), the result cache and
+--stream (time to the first event against the whole reply).
+Prints upstream call counts and latencies and exits 1 when a check fails.
+
+Usage: python3 bench_generate.py [--clients 8] [--delay 0.5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import generate
+
+GENERATE_PY = Path(__file__).resolve().parent / "generate.py"
+
+REPLY = {
+    "executive_summary": "The pilot is likely to succeed with early adopters.",
+    "positive_outcomes": ["Faster onboarding", "Clear demand signal"],
+    "potential_risks": ["Churn after the trial", "Support load"],
+    "recommendations": ["Start with one segment", "Track activation weekly"],
+}
+
+
+class FakeGemini(ThreadingHTTPServer):
+    """
+    generateContent stand-in: fixed reply after `delay`, optional failures first.
+    streamGenerateContent sends the same reply in `chunks` SSE events spread over `delay`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.delay = delay
+        self.chunks = 8
+        self.fail_with = []  # statuses for the next requests, e.g. [429, 503]
+        self.calls = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    def reset(self, delay: float = None, fail_with=()):
+        with self.lock:
+            self.calls = 0
+            self.connections = set()
+            self.fail_with = list(fail_with)
+            if delay is not None:
+                self.delay = delay
+
+    def handle_error(self, request, client_address):
+        # A client that timed out closed the socket before the delayed reply
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/v1beta"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            server.calls += 1
+            server.connections.add(self.client_address)
+            status = server.fail_with.pop(0) if server.fail_with else 200
+        if status != 200:
+            self._send(status, {"error": {"code": status}}, {"Retry-After": "0.05"})
+            return
+        if ":streamGenerateContent" in self.path:
+            self._stream(server.delay, server.chunks)
+            return
+        time.sleep(server.delay)
+        text = json.dumps(REPLY)
+        self._send(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+    def _stream(self, delay, chunks):
+        text = f"```json\n{json.dumps(REPLY, indent=2)}\n```"  # fenced and pretty-printed, as the model writes it
+        size = -(-len(text) // chunks)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(0, len(text), size):
+            time.sleep(delay / chunks)
+            event = {"candidates": [{"content": {"parts": [{"text": text[i:i + size]}]}}]}
+            data = f"data: {json.dumps(event)}\r\n\r\n".encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_clients(payloads, env):
+    """One generate.py process per payload, all at once; (results, seconds)."""
+    t0 = time.perf_counter()
+    procs = [subprocess.Popen([sys.executable, str(GENERATE_PY)], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE, env=env, text=True) for _ in payloads]
+    for proc, payload in zip(procs, payloads):
+        proc.stdin.write(json.dumps(payload))
+        proc.stdin.close()
+    results = [json.loads(proc.stdout.read() or "{}") for proc in procs]
+    for proc in procs:
+        proc.wait()
+    return results, time.perf_counter() - t0
+
+
+def run_stream(payload, env):
+    """One generate.py --stream process; ([(seconds, event)], seconds)."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(GENERATE_PY), "--stream"], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env, text=True)
+    proc.stdin.write(json.dumps(payload))
+    proc.stdin.close()
+    events = [(time.perf_counter() - t0, json.loads(line)) for line in proc.stdout]
+    proc.wait()
+    return events, time.perf_counter() - t0
+
+
+def payload(i: int, variant: int = 0) -> dict:
+    base = {
+        "startupName": f"Acme {i}",
+        "actionTest": "Launch a free tier",
+        "context": "B2B scheduling tool for clinics",
+        "targetAudience": "Clinic managers",
+    }
+    if variant % 2:  # same request, different case and spacing
+        base = {k: f"  {v.upper()}   " for k, v in base.items()}
+    return base
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--clients", type=int, default=8, help="concurrent generate.py processes")
+    ap.add_argument("--delay", type=float, default=0.5, help="fake model latency in seconds")
+    args = ap.parse_args()
+
+    server = FakeGemini(args.delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    failures = []
+
+    def check(name, ok, detail):
+        print(f"{name:<34}{'ok' if ok else 'FAIL':<6}{detail}")
+        if not ok:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The result cache is off (in-process tier only) until the cache checks
+        env = {**os.environ, "GEMINI_API_BASE": server.base, "GEMINI_API_KEY": "fake",
+               "SCENARIO_INFLIGHT_DIR": tmp, "SCENARIO_RETRY_BACKOFF": "0.05", "SCENARIO_CACHE_DIR": ""}
+        try:
+            results, elapsed = run_clients([payload(0, v) for v in range(args.clients)], env)
+            check("identical requests coalesced", all(r.get("ok") for r in results) and server.calls == 1,
+                  f"{args.clients} clients, {server.calls} upstream call(s), {elapsed:.2f} s")
+
+            server.reset()
+            results, elapsed = run_clients([payload(i) for i in range(args.clients)], env)
+            check("distinct requests not coalesced", all(r.get("ok") for r in results)
+                  and server.calls == args.clients, f"{server.calls} upstream calls, {elapsed:.2f} s")
+
+            server.reset(fail_with=[429, 503])
+            results, elapsed = run_clients([payload(100)], env)
+            check("retry on 429/503", results[0].get("ok") and server.calls == 3,
+                  f"{server.calls} upstream calls, {elapsed:.2f} s")
+
+            server.reset(fail_with=[503] * 10)
+            results, elapsed = run_clients([payload(101)], {**env, "SCENARIO_MAX_RETRIES": "2"})
+            check("gives up after max retries", not results[0].get("ok") and server.calls == 3,
+                  f"{server.calls} upstream calls, {elapsed:.2f} s")
+
+            server.reset(delay=2.0)
+            results, elapsed = run_clients([payload(102)], {**env, "SCENARIO_READ_TIMEOUT": "0.3",
+                                                            "SCENARIO_MAX_RETRIES": "1"})
+            check("read timeout", not results[0].get("ok") and elapsed < 2.0,
+                  f"{server.calls} upstream calls, failed after {elapsed:.2f} s")
+
+            # Result cache shared by every process: repeats differing in case/spacing skip the model
+            server.reset(delay=args.delay)
+            cache_env = {**env, "SCENARIO_CACHE_DIR": os.path.join(tmp, "cache")}
+            (first,), miss_s = run_clients([payload(300)], cache_env)
+            repeats = [run_clients([payload(300, v)], cache_env) for v in range(1, 6)]
+            hit_s = min(t for _, t in repeats)
+            check("repeats served from cache", server.calls == 1 and all(r == [first] for r, _ in repeats),
+                  f"{server.calls} upstream call(s); miss {miss_s * 1000:.0f} ms, hit {hit_s * 1000:.0f} ms"
+                  f" (process start included)")
+            stats = json.loads(subprocess.run([sys.executable, str(GENERATE_PY), "--cache-stats"], env=cache_env,
+                                              capture_output=True, text=True).stdout)["all_processes"]
+            check("hit rate exposed", stats["hit_rate"] == round(5 / 6, 4),
+                  f"hits {stats['disk_hits']}, misses {stats['misses']}, hit rate {stats['hit_rate']}")
+
+            # Streaming: content events arrive while the reply is still being written,
+            # and the final result matches the non-streaming output
+            server.reset(delay=max(args.delay, 1.0))
+            events, total_s = run_stream(payload(400), env)
+            first_s = next((t for t, e in events if e["event"] in ("section", "item")), total_s)
+            result = events[-1][1] if events else {}
+            (plain,), _ = run_clients([payload(400)], env)
+            content = [e for _, e in events if e["event"] in ("section", "item")]
+            check("stream events before the end", first_s < total_s / 2 and len(content) == 7,
+                  f"{len(content)} content events; first after {first_s * 1000:.0f} ms of {total_s * 1000:.0f} ms")
+            check("stream result matches", result.get("event") == "result"
+                  and {k: v for k, v in result.items() if k != "event"} == plain,
+                  f"{server.calls} upstream calls")
+            cache_events, _ = run_stream(payload(300, 1), cache_env)
+            check("stream served from cache", [e["event"] for _, e in cache_events][-1:] == ["result"]
+                  and len(cache_events) == 8, f"{len(cache_events)} events")
+
+            # In-process calls share one pooled keep-alive connection
+            server.reset(delay=0.0)
+            generate.GEMINI_API_BASE = server.base
+            for i in range(5):
+                generate.simulate(generate.scenario_inputs(payload(200 + i)), "fake")
+            check("keep-alive connection reuse", len(server.connections) == 1,
+                  f"5 calls over {len(server.connections)} connection(s)")
+        finally:
+            server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
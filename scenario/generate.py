@@ -1,10 +1,33 @@
 import os
+import re
 import sys
 import json
-import re
-import requests
+import time
+import fcntl
+import random
+import tempfile
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
+from result_cache import INPUT_FIELDS, ResultCache, cache_key, prompt_version
+
+# Gemini REST endpoint; point GEMINI_API_BASE at a local fake endpoint for testing
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+GEMINI_MODEL = os.getenv("SCENARIO_MODEL", "gemini-1.5-flash")
+
+# Timeouts in seconds. server/index.js kills this script after 65 s, so retries stop
+# once SCENARIO_DEADLINE has passed instead of running into the kill.
+CONNECT_TIMEOUT = float(os.getenv("SCENARIO_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("SCENARIO_READ_TIMEOUT", "50"))
+DEADLINE = float(os.getenv("SCENARIO_DEADLINE", "60"))
+MAX_RETRIES = int(os.getenv("SCENARIO_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("SCENARIO_RETRY_BACKOFF", "0.5"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Lock and result files for sharing one upstream call between identical concurrent requests
+INFLIGHT_DIR = os.getenv("SCENARIO_INFLIGHT_DIR", os.path.join(tempfile.gettempdir(), "scenario-inflight"))
+
 
 def _extract_json(text: str) -> dict:
     """
@@ -42,43 +65,19 @@ def _extract_json(text: str) -> dict:
     raise ValueError("Failed to parse JSON from model response")
 
 
-def main():
-    try:
-        data = json.load(sys.stdin)
-    except Exception as e:
-        print(json.dumps({"ok": False, "error": f"Invalid JSON input: {e}"}))
-        sys.exit(1)
-
-    startup_name = data.get("startupName", "").strip()
-    action_test = data.get("actionTest", "").strip()
-    context = data.get("context", "").strip()
-    target_audience = data.get("targetAudience", "").strip()
-
-    if not (startup_name and action_test and context and target_audience):
-        print(
-            json.dumps(
-                {
-                    "ok": False,
-                    "error": "Missing required fields: startupName, actionTest, context, targetAudience",
-                }
-            )
-        )
-        sys.exit(1)
+def scenario_inputs(data: dict) -> dict:
+    """The scenario fields from a request body, stripped."""
+    return {k: str(data.get(k) or "").strip() for k in INPUT_FIELDS}
 
-    # Load .env if present
-    load_dotenv()
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        print(json.dumps({"ok": False, "error": "GEMINI_API_KEY not set"}))
-        sys.exit(1)
 
-    prompt = f"""
+def build_prompt(inputs: dict) -> str:
+    return f"""
 You are a virtual startup simulator. Analyze the scenario below and return STRICT JSON only.
 
-Startup Name: {startup_name}
-Action/Test: {action_test}
-Context: {context}
-Target Audience: {target_audience}
+Startup Name: {inputs["startupName"]}
+Action/Test: {inputs["actionTest"]}
+Context: {inputs["context"]}
+Target Audience: {inputs["targetAudience"]}
 
 Return ONLY a compact JSON object with these exact keys:
 - executive_summary: string (3-6 sentences)
@@ -95,44 +94,357 @@ Example format (do not include comments):
 }}
 """
 
+
+# The prompt with placeholders in place of the inputs: editing the prompt invalidates cached results
+PROMPT_VERSION = prompt_version(build_prompt({k: f"{{{k}}}" for k in INPUT_FIELDS}))
+RESULT_CACHE = ResultCache()
+
+
+def request_key(inputs: dict) -> str:
+    """Requests that differ only in whitespace or case get the same key."""
+    return cache_key(GEMINI_MODEL, PROMPT_VERSION, inputs)
+
+
+@lru_cache(maxsize=None)
+def _session():
+    """
+    One keep-alive connection pool per process; retries are handled in _post_json.
+    requests is imported here, so a simulation answered from the cache never loads it.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
+def _retry_delay(attempt: int, response=None) -> float:
+    """Retry-After when the server sends one, else jittered exponential backoff."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return RETRY_BACKOFF * 2 ** attempt * (0.5 + random.random())
+
+
+def _post(url: str, body: dict, api_key: str, stream: bool = False, params: dict = None):
+    """
+    POST with connect/read timeouts, retrying connection errors, timeouts and
+    429/5xx replies up to MAX_RETRIES times while DEADLINE allows. With stream=True
+    only failures before the reply starts are retried.
+    """
+    import requests
+
+    give_up = time.monotonic() + DEADLINE
+    for attempt in range(MAX_RETRIES + 1):
+        response = None
+        try:
+            response = _session().post(url, headers={"x-goog-api-key": api_key}, params=params, json=body,
+                                       timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=stream)
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+            response.close()
+            error = requests.HTTPError(f"{response.status_code} from {url}", response=response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        delay = _retry_delay(attempt, response)
+        if attempt == MAX_RETRIES or time.monotonic() + delay >= give_up:
+            break
+        time.sleep(delay)
+    raise error
+
+
+def simulate(inputs: dict, api_key: str) -> dict:
+    """One model call for the scenario; the result dict printed by main()."""
+    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:generateContent"
+    body = {"contents": [{"parts": [{"text": build_prompt(inputs)}]}]}
+    result_data = _post(url, body, api_key).json()
+    raw_text = result_data["candidates"][0]["content"]["parts"][0]["text"]
+    return _result(_extract_json(raw_text))
+
+
+def _result(parsed: dict) -> dict:
+    return {
+        "ok": True,
+        "executive_summary": parsed.get("executive_summary")
+        or parsed.get("summary")
+        or parsed.get("scenario_summary")
+        or "",
+        "positive_outcomes": parsed.get("positive_outcomes") or [],
+        "potential_risks": parsed.get("potential_risks") or [],
+        "recommendations": parsed.get("recommendations") or [],
+    }
+
+
+# ---- Streaming ----
+LIST_FIELDS = ["positive_outcomes", "potential_risks", "recommendations"]
+SUMMARY_KEYS = ["executive_summary", "summary", "scenario_summary"]
+
+
+class StreamingFields:
+    """
+    Incremental parser for the reply object as its text arrives. feed() returns
+    (key, index, value) for every top-level string value (index None) and every
+    string element of a top-level array, as soon as its closing quote is seen.
+    Text before the first "{" (code fences, prose) is skipped, as are values that
+    are not strings or arrays. The whole reply is still parsed with _extract_json
+    at the end; this only decides what can be shown early.
+    """
+
+    def __init__(self):
+        self.state = "seek"
+        self.key = None
+        self.index = 0
+        self.chars = []
+        self.string_for = None  # "key", "value" or "item"
+        self.escape = False
+        self.skip_depth = 0
+        self.skip_in_string = False
+        self.skip_resume = None
+        self.done = False
+
+    def feed(self, text: str) -> list:
+        out = []
+        for ch in text:
+            if self.done:
+                break
+            self._step(ch, out)
+        return out
+
+    def _step(self, ch: str, out: list) -> None:
+        state = self.state
+        if state == "string":
+            if self.escape:
+                self.escape = False
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                self._end_string(out)
+                return
+            self.chars.append(ch)
+        elif state == "seek":
+            if ch == "{":
+                self.state = "key"
+        elif state == "key":  # a key, or the end of the object
+            if ch == '"':
+                self._start_string("key")
+            elif ch == "}":
+                self.done = True
+        elif state == "colon":
+            if ch == ":":
+                self.state = "value"
+        elif state == "value":
+            if ch == '"':
+                self._start_string("value")
+            elif ch == "[":
+                self.state, self.index = "array", 0
+            elif not ch.isspace():
+                self._start_skip(ch, "key", out)
+        elif state == "array":
+            if ch == '"':
+                self._start_string("item")
+            elif ch == "]":
+                self.state = "key"
+            elif not ch.isspace() and ch != ",":
+                self._start_skip(ch, "array", out)
+        elif state == "skip":
+            self._skip(ch, out)
+
+    def _start_string(self, string_for: str) -> None:
+        self.state, self.string_for, self.chars = "string", string_for, []
+
+    def _end_string(self, out: list) -> None:
+        raw = "".join(self.chars)
+        try:
+            value = json.loads(f'"{raw}"')
+        except ValueError:
+            value = raw
+        if self.string_for == "key":
+            self.key, self.state = value, "colon"
+        elif self.string_for == "value":
+            out.append((self.key, None, value))
+            self.state = "key"
+        else:
+            out.append((self.key, self.index, value))
+            self.index += 1
+            self.state = "array"
+
+    def _start_skip(self, ch: str, resume: str, out: list) -> None:
+        self.state, self.skip_resume, self.skip_depth, self.skip_in_string = "skip", resume, 0, False
+        self._skip(ch, out)
+
+    def _skip(self, ch: str, out: list) -> None:
+        """Consume a non-string value up to the comma or closing bracket after it."""
+        if self.skip_in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                self.skip_in_string = False
+        elif ch == '"':
+            self.skip_in_string = True
+        elif ch in "{[":
+            self.skip_depth += 1
+        elif ch in "}]":
+            if self.skip_depth == 0:  # closes the enclosing object/array
+                self.state = self.skip_resume
+                self._step(ch, out)
+            else:
+                self.skip_depth -= 1
+        elif ch == "," and self.skip_depth == 0:
+            self.state = self.skip_resume
+
+
+def _iter_stream_text(response):
+    """Text fragments from a streamGenerateContent (alt=sse) reply."""
+    response.encoding = "utf-8"
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):  # each chunk as it arrives
+        if not line or not line.startswith("data:"):
+            continue
+        chunk = json.loads(line[5:])
+        for candidate in chunk.get("candidates") or []:
+            for part in (candidate.get("content") or {}).get("parts") or []:
+                if part.get("text"):
+                    yield part["text"]
+
+
+def content_events(result: dict):
+    """The stream events for a finished result (a cache hit or a coalesced call)."""
+    if result.get("executive_summary"):
+        yield {"event": "section", "key": "executive_summary", "data": result["executive_summary"]}
+    for key in LIST_FIELDS:
+        for i, item in enumerate(result.get(key) or []):
+            yield {"event": "item", "key": key, "index": i, "data": item}
+
+
+def simulate_stream(inputs: dict, api_key: str, emit) -> dict:
+    """
+    simulate() over streamGenerateContent, calling emit() with the summary and each
+    list item as soon as they are complete in the reply. Returns the same result dict.
+    """
+    url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:streamGenerateContent"
+    body = {"contents": [{"parts": [{"text": build_prompt(inputs)}]}]}
+    fields, parts, summary_sent = StreamingFields(), [], False
+    with _post(url, body, api_key, stream=True, params={"alt": "sse"}) as response:
+        for text in _iter_stream_text(response):
+            parts.append(text)
+            for key, index, value in fields.feed(text):
+                if index is None and key in SUMMARY_KEYS and not summary_sent and value:
+                    summary_sent = True
+                    emit({"event": "section", "key": "executive_summary", "data": value})
+                elif index is not None and key in LIST_FIELDS:
+                    emit({"event": "item", "key": key, "index": index, "data": value})
+    return _result(_extract_json("".join(parts)))
+
+
+def coalesced(key: str, produce):
+    """
+    produce() once for callers with the same key that overlap in time, across threads
+    and processes (each simulation is its own process). The first caller holds
+    <key>.lock while it calls upstream and then publishes its result; callers that
+    were waiting on the lock take that result instead of calling again. Only results
+    finished after a caller arrived are shared, so an earlier run is never replayed,
+    and a failed call is not shared (the next waiter calls upstream itself).
+    Returns (result, shared).
+    """
+    os.makedirs(INFLIGHT_DIR, exist_ok=True)
+    arrived = time.time()
+    base = os.path.join(INFLIGHT_DIR, key)
+    with open(f"{base}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(f"{base}.json", encoding="utf-8") as f:
+                published = json.load(f)
+            if published["finished"] >= arrived:
+                return published["result"], True
+        except (OSError, ValueError, KeyError):
+            pass
+        result = produce()
+        tmp = f"{base}.json.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"finished": time.time(), "result": result}, f)
+        os.replace(tmp, f"{base}.json")
+    _sweep_inflight()
+    return result, False
+
+
+def _sweep_inflight() -> None:
+    """Remove lock/result files old enough that no caller can still be waiting on them."""
+    cutoff = time.time() - 2 * DEADLINE
     try:
-        # Use Gemini REST API directly
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={api_key}"
-        
-        headers = {
-            "Content-Type": "application/json",
-        }
-        
-        data = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }]
-        }
-        
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        
-        result_data = response.json()
-        raw_text = result_data["candidates"][0]["content"]["parts"][0]["text"]
-        
-        parsed = _extract_json(raw_text)
-        result = {
-            "ok": True,
-            "executive_summary": parsed.get("executive_summary")
-            or parsed.get("summary")
-            or parsed.get("scenario_summary")
-            or "",
-            "positive_outcomes": parsed.get("positive_outcomes") or [],
-            "potential_risks": parsed.get("potential_risks") or [],
-            "recommendations": parsed.get("recommendations") or [],
-        }
-        print(json.dumps(result))
-    except Exception as e:
-        print(json.dumps({"ok": False, "error": f"Model error: {e}"}))
+        for entry in os.scandir(INFLIGHT_DIR):
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+    except OSError:
+        pass
+
+
+def main():
+    if "--cache-stats" in sys.argv[1:]:
+        print(json.dumps(RESULT_CACHE.stats()))
+        return
+    # --stream: newline-delimited JSON events instead of one document. "section"
+    # (executive_summary) and "item" events arrive as the model writes them; the last
+    # event is "result" with the same fields as the non-streaming output, or "error".
+    stream = "--stream" in sys.argv[1:]
+
+    def emit(event):
+        print(json.dumps(event), flush=True)
+
+    def fail(error):
+        print(json.dumps({"event": "error", "ok": False, "error": error} if stream else {"ok": False, "error": error}))
         sys.exit(1)
 
+    def finish(result, events=()):
+        if not stream:
+            print(json.dumps(result))
+            return
+        for event in events:
+            emit(event)
+        emit({"event": "result", **result})
+
+    try:
+        data = json.load(sys.stdin)
+    except Exception as e:
+        fail(f"Invalid JSON input: {e}")
+
+    inputs = scenario_inputs(data)
+    if not all(inputs.values()):
+        fail("Missing required fields: startupName, actionTest, context, targetAudience")
+
+    # Repeats of an earlier simulation (up to whitespace and case) skip the model
+    key = request_key(inputs)
+    cached = RESULT_CACHE.get(key)
+    if cached is not None:
+        finish(cached, content_events(cached))
+        return
+
+    # Load .env if present
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        fail("GEMINI_API_KEY not set")
+
+    def produce():
+        result = simulate_stream(inputs, api_key, emit) if stream else simulate(inputs, api_key)
+        RESULT_CACHE.put(key, result)
+        return result
+
+    try:
+        result, shared = coalesced(key, produce)
+    except Exception as e:
+        fail(f"Model error: {e}")
+    # A coalesced caller gets the leader's finished result, so it sends all content at once
+    finish(result, content_events(result) if shared else ())
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
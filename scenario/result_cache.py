@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Result cache for startup scenario simulations, shared by generate.py and app.py.
+
+Keys hash the model, a prompt version and the scenario inputs with whitespace
+collapsed and case folded, so resubmissions that differ only in spacing or case
+are served from the cache. There are two tiers. An in-process LRU serves repeats
+within one Flask process. A directory of JSON files, one per key, is shared by
+every process. Entries expire after a TTL, and each tier is bounded by its own
+LRU entry limit. Hit and miss counts are kept in memory per process and added
+to the cumulative totals in stats.json every STATS_FLUSH_INTERVAL seconds and
+at exit, so lookups never wait on the stats file.
+
+Usage: python3 result_cache.py [stats | clear]
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Empty SCENARIO_CACHE_DIR keeps only the in-process tier; the default is <repo>/cache/scenario
+CACHE_DIR = os.getenv("SCENARIO_CACHE_DIR",
+                      os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "scenario"))
+CACHE_TTL = float(os.getenv("SCENARIO_CACHE_TTL", str(24 * 3600)))  # seconds
+CACHE_MAX_ENTRIES = int(os.getenv("SCENARIO_CACHE_MAX_ENTRIES", "1024"))
+MEMORY_MAX_ENTRIES = int(os.getenv("SCENARIO_CACHE_MEMORY_ENTRIES", "256"))
+STATS_FLUSH_INTERVAL = float(os.getenv("SCENARIO_CACHE_STATS_FLUSH", "10"))  # seconds
+
+INPUT_FIELDS = ["startupName", "actionTest", "context", "targetAudience"]
+_COUNTERS = ("memory_hits", "disk_hits", "misses", "expired", "stores")
+
+
+def normalise_inputs(inputs: Dict) -> Dict:
+    """Fields with repeated whitespace collapsed and case folded, for comparing requests."""
+    return {k: " ".join(str(inputs.get(k) or "").split()).casefold() for k in INPUT_FIELDS}
+
+
+def prompt_version(template: str) -> str:
+    """Short hash of a prompt template; editing the prompt starts a fresh set of keys."""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+def cache_key(model: str, version: str, inputs: Dict) -> str:
+    payload = json.dumps([model, version, normalise_inputs(inputs)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _hit_rate(counts: Dict[str, int]) -> Optional[float]:
+    lookups = counts["memory_hits"] + counts["disk_hits"] + counts["misses"]
+    return round((counts["memory_hits"] + counts["disk_hits"]) / lookups, 4) if lookups else None
+
+
+class ResultCache:
+    """
+    get()/put() JSON-serialisable results by key. A disk hit is copied into the
+    in-process tier and touches the file's mtime, so eviction (oldest mtime first)
+    drops the least recently used entries.
+    """
+
+    def __init__(self, path: str = CACHE_DIR, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES,
+                 memory_entries: int = MEMORY_MAX_ENTRIES):
+        self.path = path or None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (created, value)
+        self.counts = dict.fromkeys(_COUNTERS, 0)
+        self._unflushed = dict.fromkeys(_COUNTERS, 0)  # counted since the last write to stats.json
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()  # Flask serves requests from several threads
+        if self.path:
+            atexit.register(self.flush_stats)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self.memory.get(key)
+            fresh = entry is not None and time.time() - entry[0] <= self.ttl
+            if fresh:
+                self.memory.move_to_end(key)
+            elif entry is not None:
+                del self.memory[key]
+        if fresh:
+            self._count("memory_hits")
+            return entry[1]
+        if entry is not None:
+            self._count("expired")
+        entry = self._read(key)
+        if entry is not None:
+            self._remember(key, entry["created"], entry["value"])
+            self._count("disk_hits")
+            return entry["value"]
+        self._count("misses")
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        created = time.time()
+        self._remember(key, created, value)
+        if self.path:
+            try:
+                os.makedirs(self.path, exist_ok=True)
+                p = self._entry_path(key)
+                tmp = f"{p}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"created": created, "value": value}, f, ensure_ascii=False)
+                os.replace(tmp, p)
+                self._evict()
+            except OSError:
+                pass  # the cache is an optimisation; a read-only or full disk must not fail the request
+        self._count("stores")
+
+    def clear(self) -> int:
+        with self._lock:
+            self.memory.clear()
+        removed = 0
+        if self.path and os.path.isdir(self.path):
+            for e in os.scandir(self.path):
+                if e.name.endswith(".json") and e.name != "stats.json":
+                    os.remove(e.path)
+                    removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        """This process's counters and hit rate, plus the totals of every process when there is a disk tier."""
+        out = {"process": {**self.counts, "hit_rate": _hit_rate(self.counts), "memory_entries": len(self.memory)}}
+        if self.path:
+            with self._lock:
+                pending = dict(self._unflushed)
+            saved = self._read_totals()
+            totals = {k: saved[k] + pending[k] for k in _COUNTERS}
+            out["all_processes"] = {**totals, "hit_rate": _hit_rate(totals), "disk_entries": self._disk_entries()}
+        return out
+
+    # ---- internals ----
+    def _remember(self, key: str, created: float, value: Any) -> None:
+        with self._lock:
+            self.memory[key] = (created, value)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[Dict]:
+        if not self.path:
+            return None
+        p = self._entry_path(key)
+        try:
+            with open(p, encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["created"] > self.ttl:
+                os.remove(p)
+                self._count("expired")
+                return None
+            os.utime(p)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry
+
+    def _evict(self) -> None:
+        entries = [e for e in os.scandir(self.path) if e.name.endswith(".json") and e.name != "stats.json"]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(e.path)
+            except FileNotFoundError:
+                pass  # another process evicted it first
+
+    def _disk_entries(self) -> int:
+        try:
+            return sum(e.name.endswith(".json") and e.name != "stats.json" for e in os.scandir(self.path))
+        except OSError:
+            return 0
+
+    def flush_stats(self) -> None:
+        """Add the counts since the last flush to stats.json (registered to run at exit)."""
+        with self._lock:
+            pending, self._unflushed = self._unflushed, dict.fromkeys(_COUNTERS, 0)
+            self._flushed_at = time.monotonic()
+        if not self.path or not any(pending.values()):
+            return
+        # Cumulative counters for every process (generate.py runs once per request)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(os.path.join(self.path, "stats.lock"), "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                totals = self._read_totals()
+                for k, n in pending.items():
+                    totals[k] += n
+                tmp = os.path.join(self.path, f"stats.json.{os.getpid()}.tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(totals, f)
+                os.replace(tmp, os.path.join(self.path, "stats.json"))
+        except OSError:
+            pass
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counts[counter] += 1
+            self._unflushed[counter] += 1
+            due = self.path is not None and time.monotonic() - self._flushed_at >= STATS_FLUSH_INTERVAL
+        if due:
+            self.flush_stats()
+
+    def _read_totals(self) -> Dict[str, int]:
+        try:
+            with open(os.path.join(self.path, "stats.json"), encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+        return {k: int(saved.get(k, 0)) for k in _COUNTERS}
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = ResultCache()
+    if command == "clear":
+        print(json.dumps({"removed": cache.clear()}))
+    elif command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    else:
+        print("Usage: python3 result_cache.py [stats | clear]", file=sys.stderr)
+        sys.exit(2)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark corpus queries: re-parsing every overview and filtering (what answering a
+question took before the corpus store) against indexed queries on a stored corpus,
+on synthetic overviews with varied TRLs, budgets, currencies and risk owners.
+Checks both return the same projects.
+
+Usage: python3 bench_corpus.py [--projects 500] [--items 5] [--repeat 5]
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# The plan_generator package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_parse_overview import synthetic_overview  # noqa: E402
+from plan_generator.corpus import Corpus, tokens  # noqa: E402
+from plan_generator.parser import parse_overview  # noqa: E402
+
+# (conditions, equivalent filter over an Overview)
+QUERIES = [
+    (["trl_start=6", "budget.total>1M", "currency=AUD", "risk_owner:cto"],
+     lambda ov: ov.trl_start == 6 and ov.budget.total > 1e6 and ov.budget.currency == "AUD"
+     and any(r.owner.lower() == "cto" for r in ov.risks)),
+    (["trl_end>=8"], lambda ov: ov.trl_end is not None and ov.trl_end >= 8),
+    (["budget.total<=500k", "currency=USD"], lambda ov: 0 < ov.budget.total <= 5e5 and ov.budget.currency == "USD"),
+    (["title:co 42"], lambda ov: {"co", "42"} <= tokens(f"{ov.project_title} {ov.company_name} {ov.product_name}")),
+]
+
+
+def synthetic_corpus(projects: int, items: int, seed: int = 0):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(projects):
+        trl = rng.randint(1, 7)
+        text = synthetic_overview(items) \
+            .replace("Title: Synthetic Co", f"Title: Synthetic Co {i}") \
+            .replace("Start: 5; End: 7", f"Start: {trl}; End: {trl + rng.randint(0, 2)}") \
+            .replace("Total: 1,250,000", f"Total: {rng.randrange(100, 3000) * 1000:,}") \
+            .replace("Currency: AUD", f"Currency: {rng.choice(['AUD', 'AUD', 'USD', 'EUR'])}") \
+            .replace("Owner: CTO", f"Owner: {rng.choice(['CTO', 'CFO', 'PM', 'Engineering'])}")
+        texts.append(text)
+    return texts
+
+
+def _best(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--projects", type=int, default=500)
+    ap.add_argument("--items", type=int, default=5, help="bullet items per overview section")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    texts = synthetic_corpus(args.projects, args.items)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = Path(tmp) / "overviews.jsonl"
+        corpus = Corpus(store)
+        for i, text in enumerate(texts):
+            corpus.add(parse_overview(text), f"synthetic/{i}.pdf")
+        corpus.save()
+
+        load_s, corpus = _best(lambda: Corpus(store), args.repeat)
+
+        def build():
+            c = Corpus(store)
+            c.query([])
+            return c
+        build_s, corpus = _best(build, args.repeat)
+
+    print(f"projects={args.projects} items={args.items}; load {load_s * 1000:.1f} ms, "
+          f"load + index {build_s * 1000:.1f} ms")
+    print(f"{'query':<58}{'hits':>6}{'re-parse ms':>14}{'indexed ms':>12}{'speed-up':>10}")
+    for conditions, keep in QUERIES:
+        scan_s, scanned = _best(lambda: [i for i, t in enumerate(texts) if keep(parse_overview(t))], args.repeat)
+        index_s, found = _best(lambda: corpus.query(conditions), args.repeat)
+        found_ids = sorted(int(e["source"].split("/")[1].split(".")[0]) for e in found)
+        if found_ids != scanned:
+            raise AssertionError(f"{conditions}: index returned {len(found_ids)}, scan {len(scanned)}")
+        print(f"{' '.join(conditions):<58}{len(found):>6}{scan_s * 1000:>14.1f}{index_s * 1000:>12.3f}"
+              f"{scan_s / index_s:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check and time the frozen-value guardrail: the TRL phrasings it must accept or
+flag in aim_text, that every frozen value targets a narrative section (the tables
+are computed, never generated), then check_frozen_values over a full set of plan
+blocks built from a synthetic overview.
+
+Usage: python3 bench_guardrail.py [--items 5 50] [--repeat 20]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# The plan_generator package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_parse_overview import synthetic_overview  # noqa: E402
+from plan_generator.guardrail import check_frozen_values, frozen_values  # noqa: E402
+from plan_generator.model import to_jsonable  # noqa: E402
+from plan_generator.parser import parse_overview  # noqa: E402
+from plan_generator.prompts import NARRATIVE_KEYS  # noqa: E402
+from plan_generator.tables import plan_tables  # noqa: E402
+
+# aim_text phrasings for an overview going from TRL 4 to TRL 7: (text, expected problem or None)
+TRL_PHRASINGS = [
+    ("The project moves the platform from TRL 4 to TRL 7.", None),
+    ("The project moves the platform from TRL 4 to 7.", None),
+    ("Work spans TRLs 4–7 over two years.", None),
+    ("Work spans TRLs 4-7 over two years.", None),
+    ("Maturity rises from TRL-4 through TRL-7.", None),
+    ("It starts at TRL4 and finishes at TRL7.", None),
+    ("Validation covers TRLs 4 and 7.", None),
+    ("The project moves the platform from TRL 4 to 8.", "altered"),
+    ("Work spans TRLs 4–6 over two years.", "altered"),
+    ("The project starts at TRL 4.", "dropped"),
+]
+
+
+def check_trl_phrasings() -> None:
+    canonical = {"trl_start": 4, "trl_end": 7}
+    for text, expected in TRL_PHRASINGS:
+        problems = check_frozen_values(canonical, {"aim_text": text}).get("aim_text", [])
+        got = next((kind for kind in ("altered", "dropped") if any(kind in p for p in problems)), None)
+        if got != expected:
+            raise AssertionError(f"{text!r}: expected {expected or 'no problem'}, got {problems or 'no problem'}")
+    print(f"TRL phrasings: {len(TRL_PHRASINGS)} checked")
+
+
+def check_narrative_targets(canonical) -> None:
+    tables = {s for s, _, _ in frozen_values(canonical) if s not in NARRATIVE_KEYS}
+    if tables:
+        raise AssertionError(f"frozen values target computed sections {sorted(tables)}")
+
+
+def plan_blocks(items: int):
+    """(canonical, blocks) for a synthetic overview: computed tables plus narrative naming both TRLs."""
+    overview = parse_overview(synthetic_overview(items))
+    blocks = {k: f"Narrative for {k}. " * 40 for k in NARRATIVE_KEYS}
+    blocks["aim_text"] += f"The project moves from TRL {overview.trl_start} to {overview.trl_end}."
+    blocks.update(to_jsonable(plan_tables(overview)))
+    return overview.to_dict(), blocks
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--items", type=int, nargs="+", default=[5, 50])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    check_trl_phrasings()
+    print(f"\n{'items':>6}{'blocks':>8}{'chars':>10}{'problems':>10}{'check ms':>10}")
+    for items in args.items:
+        canonical, blocks = plan_blocks(items)
+        check_narrative_targets(canonical)
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            problems = check_frozen_values(canonical, blocks)
+            best = min(best, time.perf_counter() - t0)
+        if problems:
+            raise AssertionError(f"computed blocks flagged (items={items}): {problems}")
+        chars = sum(len(str(b)) for b in blocks.values())
+        print(f"{items:>6}{len(blocks):>8}{chars:>10}{len(problems):>10}{best * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark parse_overview_text (single-pass section index) against the original
+parser that ran one whole-document regex per field.
+
+Runs large synthetic overviews and adversarial inputs, checks both parsers agree
+on every generated input and on the bundled PDFs, checks malformed values (a TRL
+of 12, an unparseable contingency) are dropped rather than failing the parse, and
+prints timings.
+
+Usage: python3 bench_parse_overview.py [--sizes 10 100 1000] [--repeat 5]
+"""
+
+import re
+import json
+import time
+import sys
+import random
+import argparse
+from pathlib import Path
+from typing import Dict
+
+# The plan_generator package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from plan_generator.parser import (  # noqa: E402
+    _clean, _num, _split_semicolons, _bullet_lines,
+    parse_overview_text,
+)
+from plan_generator.pdf import extract_text_from_pdf  # noqa: E402
+
+PDF_DIR = Path(__file__).resolve().parent.parent / "plan_generator" / "pdfs"
+
+# Reference implementation: the regex-per-field parser this module replaced, kept verbatim.
+def legacy_parse_overview_text(text: str) -> Dict:
+    """
+    Parse a project overview plan's text into a structured data_dict.
+    """
+    t = text.replace("\r", "")
+
+    data = {
+        "project_title": "",
+        "company_name": "",
+        "product_name": "",
+        "product_summary": "",
+        "problem_statement": "",
+        "objective": "",
+        "key_outcomes": [],
+        "start_date": "",
+        "end_date": "",
+        "milestones": [],
+        "budget": {
+            "currency": "",
+            "total": 0.0,
+            "capex": 0.0,
+            "opex": 0.0,
+            "contingency_percent": 0.0,
+            "funding_sources": []
+        },
+        "sponsor": {"name": "", "role": ""},
+        "lead": {"name": "", "role": ""},
+        "team": [],
+        "stakeholders": [],
+        "partners": [],
+        "kpis": [],
+        "risks": [],
+        "reporting": {"deliverables": []},
+        "trl_start": None,
+        "trl_end": None,
+    }
+
+    # Title & (heuristic) company
+    m = re.search(r"^Title:\s*(.+)$", t, flags=re.M | re.I)
+    if m:
+        data["project_title"] = _clean(m.group(1))
+        # Heuristic: "<Company> — <Project>" or "<Company> - <Project>"
+        if "—" in data["project_title"]:
+            data["company_name"] = _clean(data["project_title"].split("—")[0])
+        elif " - " in data["project_title"]:
+            data["company_name"] = _clean(data["project_title"].split(" - ")[0])
+
+    # Product & Summary
+    m = re.search(r"Product:\s*(.+)", t, re.I)
+    if m:
+        data["product_name"] = _clean(m.group(1))
+    m = re.search(r"Summary:\s*(.+)", t, re.I)
+    if m:
+        data["product_summary"] = _clean(m.group(1))
+
+    # Problem Statement
+    m = re.search(r"Problem Statement\s*(.+?)(?:\n\s*\n|Objective\b)", t, re.I | re.S)
+    if m:
+        data["problem_statement"] = _clean(m.group(1))
+
+    # Objective
+    m = re.search(r"Objective\s*(.+?)(?:\n\s*\n|Key Outcomes\b)", t, re.I | re.S)
+    if m:
+        data["objective"] = _clean(m.group(1))
+
+    # Key Outcomes
+    m = re.search(r"Key Outcomes\s*(.+?)(?:\n\s*\n|Timeline\b)", t, re.I | re.S)
+    if m:
+        data["key_outcomes"] = _bullet_lines(m.group(1))
+
+    # Timeline dates
+    m = re.search(r"Start\s*Date:\s*([0-9\-\/]+)\s*\|\s*End\s*Date:\s*([0-9\-\/]+)", t, re.I)
+    if m:
+        data["start_date"], data["end_date"] = m.group(1), m.group(2)
+
+    # Milestones block
+    m = re.search(r"Milestones\s*(.+?)(?:\n\s*\n|Budget\b|People\b)", t, re.I | re.S)
+    if m:
+        for line in _bullet_lines(m.group(1)):
+            # "Name (YYYY-MM-DD, Owner: Role)"
+            m2 = re.match(r"(.*?)\s*\((\d{4}-\d{2}-\d{2}),\s*Owner:\s*(.*?)\)\s*$", line)
+            if m2:
+                data["milestones"].append(
+                    {"name": _clean(m2.group(1)), "due": m2.group(2), "owner": _clean(m2.group(3))}
+                )
+            else:
+                data["milestones"].append({"name": line, "due": "", "owner": ""})
+
+    # Budget block
+    cur = re.search(r"Currency:\s*([A-Z]{3})", t, re.I)
+    tot = re.search(r"Total:\s*([\d,\.]+)", t, re.I)
+    cap = re.search(r"Capex:\s*([\d,\.]+)", t, re.I)
+    opx = re.search(r"Opex:\s*([\d,\.]+)", t, re.I)
+    cont = re.search(r"Contingency:\s*([\d\.]+)\s*%", t, re.I)
+    fund = re.search(r"Funding:\s*(.+)", t, re.I)
+    if cur:
+        data["budget"]["currency"] = cur.group(1).upper()
+    if tot:
+        data["budget"]["total"] = _num(tot.group(1))
+    if cap:
+        data["budget"]["capex"] = _num(cap.group(1))
+    if opx:
+        data["budget"]["opex"] = _num(opx.group(1))
+    if cont:
+        data["budget"]["contingency_percent"] = float(cont.group(1))
+    if fund:
+        data["budget"]["funding_sources"] = [x for x in re.split(r";|,", fund.group(1)) if x.strip()]
+
+    # People
+    s = re.search(r"Sponsor:\s*(.*?)\s*\((.*?)\)", t, re.I)
+    if s:
+        data["sponsor"] = {"name": _clean(s.group(1)), "role": _clean(s.group(2))}
+    l = re.search(r"Project Lead:\s*(.*?)\s*\((.*?)\)", t, re.I)
+    if l:
+        data["lead"] = {"name": _clean(l.group(1)), "role": _clean(l.group(2))}
+    team_block = re.search(r"Team:\s*(.+?)(?:\n\s*\n|Stakeholders\b)", t, re.I | re.S)
+    if team_block:
+        members = [x.strip() for x in team_block.group(1).split(";") if x.strip()]
+        for mbr in members:
+            mm = re.match(r"(.*?)\s*\((.*?)\)", mbr)
+            if mm:
+                data["team"].append({"name": _clean(mm.group(1)), "role": _clean(mm.group(2))})
+            else:
+                data["team"].append({"name": _clean(mbr), "role": ""})
+
+    # Stakeholders
+    stk = re.search(r"Stakeholders\s*(.+?)(?:\n\s*\n|Partners\b)", t, re.I | re.S)
+    if stk:
+        data["stakeholders"] = _split_semicolons(stk.group(1))
+
+    # Partners
+    prt = re.search(r"Partners\s*(.+?)(?:\n\s*\n|KPIs\b)", t, re.I | re.S)
+    if prt:
+        data["partners"] = _split_semicolons(prt.group(1))
+
+    # KPIs
+    kpi_block = re.search(r"KPIs\s*(.+?)(?:\n\s*\n|Risks\b)", t, re.I | re.S)
+    if kpi_block:
+        for line in _bullet_lines(kpi_block.group(1)):
+            name = _clean(re.split(r"—|-", line)[0])
+            target = ""
+            measure = ""
+            m1 = re.search(r"Target:\s*([^—-]+)", line)
+            m2 = re.search(r"Measure:\s*(.+)$", line)
+            if m1:
+                target = _clean(m1.group(1))
+            if m2:
+                measure = _clean(m2.group(1))
+            data["kpis"].append({"name": name, "target": target, "measure": measure})
+
+    # Risks
+    risk_block = re.search(r"Risks\s*(.+?)(?:\n\s*\n|Reporting\b)", t, re.I | re.S)
+    if risk_block:
+        for line in _bullet_lines(risk_block.group(1)):
+            rid = ""
+            desc = line
+            like = impact = owner = mitigation = ""
+            m_id = re.match(r"(R\d+):\s*(.*)", line)
+            if m_id:
+                rid, desc = m_id.group(1), m_id.group(2)
+            m_meta = re.search(r"\(Likelihood:\s*(.*?),\s*Impact:\s*(.*?),\s*Owner:\s*(.*?)\)", desc)
+            if m_meta:
+                like, impact, owner = _clean(m_meta.group(1)), _clean(m_meta.group(2)), _clean(m_meta.group(3))
+                desc = _clean(re.sub(r"\(Likelihood:.*?\)", "", desc))
+            m_mit = re.search(r"—\s*Mitigation:\s*(.+)$", line)
+            if m_mit:
+                mitigation = _clean(m_mit.group(1))
+            data["risks"].append(
+                {
+                    "id": rid or f"R{len(data['risks'])+1}",
+                    "description": _clean(desc),
+                    "likelihood": like,
+                    "impact": impact,
+                    "owner": owner,
+                    "mitigation": mitigation,
+                }
+            )
+
+    # Reporting
+    rep_block = re.search(r"Reporting\s*(.+?)(?:\n\s*\n|TRL\b|$)", t, re.I | re.S)
+    if rep_block:
+        for name, due in re.findall(r"^- (.+?)\s*—\s*due\s*([0-9\-\/]+)", rep_block.group(1), flags=re.I | re.M):
+            data["reporting"]["deliverables"].append({"name": _clean(name), "due": due})
+
+    # TRL
+    m = re.search(r"TRL\s*Start:\s*(\d+)\s*;\s*End:\s*(\d+)", t, re.I)
+    if m:
+        data["trl_start"] = int(m.group(1))
+        data["trl_end"] = int(m.group(2))
+
+    return data
+
+
+def synthetic_overview(n: int, milestones: int = None, kpis: int = None, risks: int = None) -> str:
+    """
+    An overview in the bundled layout with n outcomes, team members and deliverables,
+    and n milestones, KPIs and risks unless those counts are given separately.
+    """
+    milestones = n if milestones is None else milestones
+    kpis = n if kpis is None else kpis
+    risks = n if risks is None else risks
+    lines = [
+        "Title: Synthetic Co — Scale Test",
+        "Product: Synthetic Platform",
+        "Summary: A generated overview used for parser benchmarks.",
+        "Problem Statement",
+        "Manual processes are slow. " * 20,
+        "Objective",
+        "Deploy the platform across many sites. " * 10,
+        "Key Outcomes",
+    ]
+    lines += [f"- Outcome {i} improves metric {i} by {i % 50}%" for i in range(n)]
+    lines += ["Timeline", "Start Date: 2025-01-01 | End Date: 2027-12-31", "Milestones"]
+    lines += [f"- Milestone {i} complete (2026-{i % 12 + 1:02d}-15, Owner: Team {i % 7})" for i in range(milestones)]
+    lines += [
+        "Budget", "Currency: AUD", "Total: 1,250,000", "Capex: 750,000", "Opex: 500,000",
+        "Contingency: 10%", "Funding: Internal fund; State grant",
+        "People", "Sponsor: Alex Doe (CEO)", "Project Lead: Sam Roe (PM)",
+        "Team: " + "; ".join(f"Member {i} (Role {i})" for i in range(n)),
+        "Stakeholders", "; ".join(f"Stakeholder {i}" for i in range(n)),
+        "Partners", "; ".join(f"Partner {i} Pty Ltd" for i in range(n)),
+        "KPIs",
+    ]
+    lines += [f"- KPI {i} — Target: {i}% — Measure: Monthly report {i}" for i in range(kpis)]
+    lines.append("Risks")
+    lines += [
+        f"- R{i}: Risk {i} (Likelihood: Medium, Impact: High, Owner: CTO) — Mitigation: Plan {i}"
+        for i in range(1, risks + 1)
+    ]
+    lines.append("Reporting")
+    lines += [f"- Report {i} — due 2026-{i % 12 + 1:02d}-30" for i in range(n)]
+    lines += ["TRL", "Start: 5; End: 7"]
+    return "\n".join(lines)
+
+
+def adversarial_inputs(n: int) -> Dict[str, str]:
+    """Inputs that make lazy DOTALL scans restart from every heading occurrence."""
+    return {
+        "repeated_headings_no_terminator": ("Objective " + "x" * 40 + " ") * n,
+        "headings_soup": "Problem Statement Milestones Team: Stakeholders Partners KPIs Risks " * n,
+        "labels_without_values": "Total: n/a Capex: n/a Sponsor: nobody Start Date: soon " * n,
+        "whitespace_flood": "Team:" + " \t" * (5 * n),
+        "unterminated_sections": "Risks\n" + "- R1: something happens\n" * n,
+    }
+
+
+def random_overview(rng: random.Random) -> str:
+    """Random mix of headings, labels, bullets and blank lines for equivalence checks."""
+    parts = [
+        "Title: A — B", "Product: P", "Summary: S", "Problem Statement", "Objective", "Objectives",
+        "Key Outcomes", "Timeline", "Start Date: 2025-01-01 | End Date: 2025-12-31", "Milestones",
+        "- M (2025-05-05, Owner: X)", "Budget", "People", "Currency: aud", "Total: 1,000",
+        "Capex: 5", "Opex: 6", "Contingency: 7 %", "Funding: a; b, c", "Sponsor: A (B)",
+        "Project Lead: C (D)", "Team: E (F); G", "Stakeholders", "Partners", "KPIs",
+        "- K — Target: 5% — Measure: m", "Risks", "- R1: r (Likelihood: L, Impact: I, Owner: O) — Mitigation: x",
+        "Reporting", "- Rep — due 2025-02-02", "TRL", "Start: 3; End: 4", "words", "", "  ", "\t",
+    ]
+    return rng.choice(["\n", " ", ""]).join(rng.choice(parts) for _ in range(rng.randint(0, 40)))
+
+
+def _best_time(fn, text: str, repeat: int):
+    """Best-of-`repeat` wall time, plus the parser's result."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def check_equivalence(samples: int = 2000) -> None:
+    rng = random.Random(0)
+    for i in range(samples):
+        text = random_overview(rng)
+        if parse_overview_text(text) != legacy_parse_overview_text(text):
+            raise AssertionError(f"parsers disagree on random sample {i}: {text!r}")
+    print(f"random inputs: {samples} samples identical")
+
+    for pdf in sorted(PDF_DIR.glob("*.pdf")):
+        text = extract_text_from_pdf(str(pdf))
+        same = parse_overview_text(text) == legacy_parse_overview_text(text)
+        print(f"{pdf.name}: {'identical' if same else 'DIFFERENT'}")
+        if not same:
+            raise AssertionError(f"parsers disagree on {pdf.name}")
+
+
+def check_malformed_values() -> None:
+    text = synthetic_overview(3).replace("Start: 5; End: 7", "Start: 5; End: 12") \
+        .replace("Contingency: 10%", "Contingency: 1.0.0%")
+    data = parse_overview_text(text)
+    if (data["trl_start"], data["trl_end"], data["budget"]["contingency_percent"]) != (5, None, 0.0):
+        raise AssertionError(f"malformed values not dropped: trl {data['trl_start']}-{data['trl_end']}, "
+                             f"contingency {data['budget']['contingency_percent']}")
+    if data["budget"]["total"] != 1250000.0 or len(data["milestones"]) != 3:
+        raise AssertionError("well-formed fields lost alongside the malformed ones")
+    print("malformed values: TRL 12 and contingency 1.0.0% dropped, rest parsed")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--skip-check", action="store_true", help="skip the equivalence checks")
+    args = ap.parse_args()
+
+    if not args.skip_check:
+        check_equivalence()
+        check_malformed_values()
+
+    print(f"\n{'input':<36}{'size':>8}{'chars':>10}{'legacy ms':>12}{'indexed ms':>12}{'speed-up':>10}")
+    for n in args.sizes:
+        cases = {"synthetic_overview": synthetic_overview(n), **adversarial_inputs(n)}
+        for name, text in cases.items():
+            old, expected = _best_time(legacy_parse_overview_text, text, args.repeat)
+            new, got = _best_time(parse_overview_text, text, args.repeat)
+            if got != expected:
+                raise AssertionError(f"parsers disagree on {name} (n={n})")
+            print(f"{name:<36}{n:>8}{len(text):>10}{old * 1e3:>12.2f}{new * 1e3:>12.2f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark extract_text_from_pdf: every text backend on the bundled overview PDFs,
+and serial against page-parallel extraction on synthetic multi-page overviews.
+
+Usage: python3 bench_pdf_extract.py [--mode all|backends|parallel] [--pages 8 32 128]
+                                    [--workers 4] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+
+# The plan_generator package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_parse_overview import synthetic_overview  # noqa: E402
+from plan_generator.parser import missing_mandatory_fields, parse_overview_text  # noqa: E402
+from plan_generator.pdf import PARALLEL_MIN_PAGES, TEXT_BACKENDS, extract_text_from_pdf  # noqa: E402
+
+BUNDLED_PDFS = Path(__file__).resolve().parent.parent / "plan_generator" / "pdfs"
+
+LINES_PER_PAGE = 60
+
+
+def _pdf_escape(line: str) -> bytes:
+    raw = line.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def write_text_pdf(path: str, pages: List[List[str]], font_size: int = 9) -> None:
+    """Write a minimal A4 PDF with one Helvetica text line per entry (enough for pdfplumber)."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        ops = [b"BT", f"/F1 {font_size} Tf {font_size + 3} TL 40 800 Td".encode()]
+        ops += [b"(" + _pdf_escape(line) + b") Tj T*" for line in lines]
+        ops.append(b"ET")
+        stream = b"\n".join(ops)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % ref for ref in page_refs)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_refs)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(out))
+
+
+def synthetic_overview_pages(n_pages: int, items: int = 5, **counts) -> List[List[str]]:
+    """
+    An overview in the bundled layout, followed by filler appendix pages up to n_pages.
+    counts: milestones / kpis / risks, passed to synthetic_overview.
+    """
+    lines = synthetic_overview(items, **counts).split("\n")
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    filler = "Appendix detail: sensor calibration data, site survey notes and vendor quotes."
+    while len(pages) < n_pages:
+        n = len(pages) + 1
+        pages.append([f"Appendix page {n}"] + [f"{filler} ({n}.{i})" for i in range(LINES_PER_PAGE - 1)])
+    return pages
+
+
+def _best_time(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def compare_backends(repeat: int) -> None:
+    names = list(TEXT_BACKENDS)
+    print(f"{'pdf':<26}" + "".join(f"{n + ' ms':>14}" for n in names) + "  same text  auto picks")
+    for pdf in sorted(BUNDLED_PDFS.glob("*.pdf")):
+        times, texts = [], []
+        for name in names:
+            t, text = _best_time(lambda: extract_text_from_pdf(str(pdf), workers=1, backend=name), repeat)
+            times.append(t)
+            texts.append(text)
+        usable = [n for n, text in zip(names, texts) if not missing_mandatory_fields(parse_overview_text(text))]
+        same = all(text == texts[-1] for text in texts)
+        print(f"{pdf.name:<26}" + "".join(f"{t * 1000:>14.1f}" for t in times)
+              + f"  {str(same):>9}  {usable[0] if usable else names[-1]}")
+
+
+def compare_parallel(pages: List[int], workers: int, repeat: int) -> None:
+    print(f"cpus={os.cpu_count()} workers={workers} auto-parallel threshold={PARALLEL_MIN_PAGES} pages")
+    print(f"{'pages':>6}{'serial s':>12}{'parallel s':>12}{'speed-up':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in pages:
+            pdf = os.path.join(tmp, f"overview_{n}.pdf")
+            write_text_pdf(pdf, synthetic_overview_pages(n))
+            serial, expected = _best_time(lambda: extract_text_from_pdf(pdf, workers=1), repeat)
+            parallel, got = _best_time(lambda: extract_text_from_pdf(pdf, workers=workers), repeat)
+            if got != expected:
+                raise AssertionError(f"parallel text differs from serial text ({n} pages)")
+            print(f"{n:>6}{serial:>12.2f}{parallel:>12.2f}{serial / parallel:>9.2f}x")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--mode", choices=["all", "backends", "parallel"], default="all")
+    ap.add_argument("--pages", type=int, nargs="+", default=[8, 32, 128])
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    if args.mode in ("all", "backends"):
+        compare_backends(args.repeat)
+    if args.mode == "all":
+        print()
+    if args.mode in ("all", "parallel"):
+        compare_parallel(args.pages, args.workers, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Measure allocations of the plan data model: N parsed overviews held as nested dicts
+against Overview records, and building the render context with defensive deep copies
+of the LLM blocks (the previous notebook mapper) against the copy-free record mapper.
+
+Usage: python3 bench_plan_model.py [--count 1000] [--items 5]
+"""
+
+import time
+import argparse
+import tracemalloc
+from copy import deepcopy
+
+from bench_parse_overview import synthetic_overview
+from plan_generator_service import generate_plan_text_blocks
+from plan_generator.context import categorize_for_aea_template_llm_only
+from plan_generator.parser import parse_overview, parse_overview_text
+
+
+def _measure(build):
+    """(retained bytes, peak bytes, seconds) of build(), keeping its result alive."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak, elapsed
+
+
+def legacy_context(llm_blocks):
+    """The previous mapper's copying: the whole blocks dict, then each structured block again."""
+    lb = deepcopy(llm_blocks)
+    for key in ("project_budget", "payment_schedule", "miles_outcomes", "evaluation_text", "reporting"):
+        lb[key] = deepcopy(lb.get(key, {}))
+    return categorize_for_aea_template_llm_only(lb)
+
+
+def _row(label, current, peak, elapsed, count):
+    print(f"{label:<28}{current / count:>14,.0f}{peak / count:>14,.0f}{elapsed * 1000:>10.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--count", type=int, default=1000, help="overviews / contexts to build")
+    ap.add_argument("--items", type=int, default=5, help="bullet items per overview section")
+    args = ap.parse_args()
+
+    texts = [synthetic_overview(args.items).replace("Product:", f"Product: #{i}") for i in range(args.count)]
+    overviews = [parse_overview(t) for t in texts]
+    if [o.to_dict() for o in overviews[:10]] != [parse_overview_text(t) for t in texts[:10]]:
+        raise AssertionError("records and dicts disagree")
+    blocks = [generate_plan_text_blocks(o) for o in overviews]
+
+    print(f"count={args.count} items={args.items}")
+    print(f"{'':<28}{'retained B/ea':>14}{'peak B/ea':>14}{'total ms':>10}")
+    _row("overviews as dicts", *_measure(lambda: [parse_overview_text(t) for t in texts]), args.count)
+    _row("overviews as records", *_measure(lambda: [parse_overview(t) for t in texts]), args.count)
+    _row("context, deep-copied", *_measure(lambda: [legacy_context(b) for b in blocks]), args.count)
+    _row("context, records", *_measure(lambda: [categorize_for_aea_template_llm_only(b) for b in blocks]),
+         args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmark of the plan pipeline on synthetic overview PDFs, through the
+production code paths: load_overview (backend choice, early stop; parse cache off),
+generate_plan_text_blocks_concurrent against the local stub LLM (configurable
+latency; prompts, guardrail, retries and the reply cache included, lookups skipped),
+categorisation and render_plan_to_file (fragment cache cleared per plan). Reports
+per-stage latency percentiles, throughput and peak memory, and compares them with
+stored baselines.
+
+Usage: python3 bench_plan_pipeline.py [--scenarios small medium large] [--plans 10]
+                                      [--llm-latency 0.05] [--llm-concurrency 4]
+                                      [--baseline bench_baselines.json] [--save-baseline]
+                                      [--tolerance 0.25] [--min-delta-ms 1]
+Exits 1 when a metric regresses by more than the tolerance.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+# The plan_generator package lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_pdf_extract import synthetic_overview_pages, write_text_pdf  # noqa: E402
+from plan_generator import llm  # noqa: E402
+from plan_generator.context import categorize_for_aea_template_llm_only  # noqa: E402
+from plan_generator.metrics import PlanMetrics, _max_rss_kib  # noqa: E402
+from plan_generator.overview import load_overview  # noqa: E402
+from plan_generator.render import fragment_renderer, render_plan_to_file  # noqa: E402
+from plan_generator.stub_model_server import serve  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "bench_baselines.json"
+
+# Overview sizes: bullet items per list (outcomes, team, deliverables, ...), the
+# milestone / KPI / risk counts, and total PDF pages (the rest is appendix filler)
+SCENARIOS = {
+    "small": {"items": 3, "milestones": 4, "kpis": 3, "risks": 3, "pages": 1},
+    "medium": {"items": 10, "milestones": 12, "kpis": 10, "risks": 10, "pages": 8},
+    "large": {"items": 40, "milestones": 48, "kpis": 40, "risks": 40, "pages": 32},
+}
+STAGES = ["extract", "parse", "generate", "categorise", "render"]
+
+
+# ---- Stages ----
+def run_plan(pdf: str, out_path: str, concurrency: int) -> Dict[str, float]:
+    """Run every stage once; returns seconds per stage."""
+    metrics = PlanMetrics()
+    t0 = time.perf_counter()
+    overview = load_overview(pdf, use_cache=False, metrics=metrics)
+    t1 = time.perf_counter()
+    blocks = llm.generate_plan_text_blocks_concurrent(overview, max_concurrency=concurrency, refresh=True,
+                                                      api_key="stub")
+    t2 = time.perf_counter()
+    context = categorize_for_aea_template_llm_only(blocks)
+    t3 = time.perf_counter()
+    render_plan_to_file(context, out_path)
+    t4 = time.perf_counter()
+    fragment_renderer().fragments.clear()  # every timed plan renders from scratch, like a new overview
+    # extract and parse (every backend tried) as load_overview's own spans report them
+    spans = metrics.spans
+    return {"extract": spans["extract"]["wall_ms"] / 1000, "parse": spans["parse"]["wall_ms"] / 1000,
+            "generate": t2 - t1, "categorise": t3 - t2, "render": t4 - t3, "total": t4 - t0}
+
+
+# ---- Statistics ----
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def run_scenario(name: str, spec: Dict, plans: int, concurrency: int) -> Dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, f"{name}.pdf")
+        counts = {k: spec[k] for k in ("milestones", "kpis", "risks")}
+        write_text_pdf(pdf, synthetic_overview_pages(spec["pages"], spec["items"], **counts))
+        pdf_bytes = os.path.getsize(pdf)
+        out_path = os.path.join(tmp, f"{name}_plan.md")
+        run_plan(pdf, out_path, concurrency)  # warm-up
+
+        samples = {stage: [] for stage in STAGES + ["total"]}
+        wall0 = time.perf_counter()
+        for _ in range(plans):
+            for stage, t in run_plan(pdf, out_path, concurrency).items():
+                samples[stage].append(t)
+        wall = time.perf_counter() - wall0
+
+        # Separate traced run: tracemalloc slows allocation-heavy stages, so it is kept out of the timings
+        tracemalloc.start()
+        run_plan(pdf, out_path, concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {"pdf_bytes": pdf_bytes}
+    for stage, values in samples.items():
+        result[stage] = {f"p{q}_ms": round(percentile(values, q) * 1000, 3) for q in (50, 95, 99)}
+    result["throughput_plans_per_s"] = round(plans / wall, 3)
+    result["peak_traced_kib"] = round(peak / 1024, 1)
+    return result
+
+
+# ---- Baselines ----
+def compare(name: str, current: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """
+    Lines describing metrics worse than the baseline by more than `tolerance` (a fraction).
+    Stage latencies are gated on p50 only (p95/p99 of a few samples are mostly noise),
+    and sub-`min_delta_ms` slowdowns of very fast stages are ignored.
+    """
+    regressions = []
+    for stage in STAGES + ["total"]:
+        before, now = baseline.get(stage, {}).get("p50_ms"), current[stage]["p50_ms"]
+        if before and now > before * (1 + tolerance) and now - before >= min_delta_ms:
+            regressions.append(f"{name}.{stage}.p50_ms: {before} -> {now} (+{(now / before - 1) * 100:.0f}%)")
+    for metric in ("peak_traced_kib",):
+        before, now = baseline.get(metric), current[metric]
+        if before and now > before * (1 + tolerance):
+            regressions.append(f"{name}.{metric}: {before} -> {now} (+{(now / before - 1) * 100:.0f}%)")
+    before, now = baseline.get("throughput_plans_per_s"), current["throughput_plans_per_s"]
+    if before and now < before * (1 - tolerance):
+        regressions.append(f"{name}.throughput_plans_per_s: {before} -> {now} ({(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_report(name: str, result: Dict, baseline: Dict) -> None:
+    print(f"\n[{name}] throughput {result['throughput_plans_per_s']} plans/s"
+          f" (baseline {baseline.get('throughput_plans_per_s', '-')}),"
+          f" peak traced {result['peak_traced_kib']} KiB (baseline {baseline.get('peak_traced_kib', '-')})")
+    print(f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'base p50':>10}{'delta':>9}")
+    for stage in STAGES + ["total"]:
+        r = result[stage]
+        base = baseline.get(stage, {}).get("p50_ms")
+        delta = f"{(r['p50_ms'] / base - 1) * 100:+.0f}%" if base else "-"
+        print(f"{stage:<12}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{base if base is not None else '-':>10}{delta:>9}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    ap.add_argument("--plans", type=int, default=10, help="timed plans per scenario")
+    ap.add_argument("--llm-latency", type=float, default=0.05, help="stub seconds per reply")
+    ap.add_argument("--llm-concurrency", type=int, default=4)
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    ap.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed regression as a fraction")
+    ap.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore smaller p50 slowdowns")
+    args = ap.parse_args()
+
+    server = serve(0, delay=args.llm_latency)
+    llm.GEMINI_API_BASE = f"http://127.0.0.1:{server.server_port}/v1beta"
+
+    stored = json.loads(Path(args.baseline).read_text()) if os.path.exists(args.baseline) else {}
+    settings = {"plans": args.plans, "llm_latency": args.llm_latency, "llm_concurrency": args.llm_concurrency}
+    if stored and stored.get("settings") != settings:
+        print(f"note: baseline was recorded with {stored.get('settings')}, this run uses {settings}")
+    print(f"python {platform.python_version()} on {platform.machine()}, cpus={os.cpu_count()}, {settings}")
+
+    results, regressions = {}, []
+    cache_dir = tempfile.TemporaryDirectory()
+    llm.llm_cache = llm.LLMResponseCache(cache_dir.name)  # replies are still written, just not to the real cache
+    try:
+        for name in args.scenarios:
+            results[name] = run_scenario(name, SCENARIOS[name], args.plans, args.llm_concurrency)
+            baseline = stored.get("scenarios", {}).get(name, {})
+            print_report(name, results[name], baseline)
+            regressions += compare(name, results[name], baseline, args.tolerance, args.min_delta_ms)
+    finally:
+        server.shutdown()
+        cache_dir.cleanup()
+    print(f"\nmax RSS {_max_rss_kib() / 1024:.1f} MiB")
+
+    if args.save_baseline:
+        scenarios = {**stored.get("scenarios", {}), **results}
+        Path(args.baseline).write_text(json.dumps({"settings": settings, "scenarios": scenarios}, indent=2) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if regressions:
+        print("\nregressions beyond tolerance:\n  " + "\n  ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -130,6 +130,80 @@ app.post("/api/simulate", (req, res) => {
   });
 });
 
+// Streaming scenario simulation: forwards generate.py's newline-delimited JSON events
+// (executive summary, one per outcome/risk/recommendation, final result) as they arrive
+app.post("/api/simulate/stream", (req, res) => {
+  const scriptPath = path.resolve(__dirname, "..", "scenario", "generate.py");
+  const py = spawn("python3", [scriptPath, "--stream"], {
+    cwd: path.resolve(__dirname, ".."),
+    env: { ...process.env },
+  });
+
+  res.setHeader("Content-Type", "application/x-ndjson");
+  res.setHeader("Cache-Control", "no-cache");
+
+  let stderr = "";
+  let sawEvent = false;
+
+  py.stdout.on("data", (d) => {
+    sawEvent = true;
+    res.write(d);
+  });
+  py.stderr.on("data", (d) => {
+    stderr += d.toString();
+  });
+
+  py.stdin.write(JSON.stringify(req.body));
+  py.stdin.end();
+
+  const timeout = setTimeout(() => {
+    py.kill("SIGKILL");
+  }, 65000);
+
+  // Client went away before the simulation finished: stop generating
+  res.on("close", () => {
+    if (!res.writableEnded) py.kill();
+  });
+
+  py.on("close", (code) => {
+    clearTimeout(timeout);
+    if (code !== 0 && !sawEvent) {
+      res.write(
+        JSON.stringify({ event: "error", ok: false, code, error: stderr }) + "\n"
+      );
+    }
+    res.end();
+  });
+});
+
+// Scenario result cache hit rates (cumulative across simulations)
+app.get("/api/simulate/cache-stats", (req, res) => {
+  const scriptPath = path.resolve(__dirname, "..", "scenario", "generate.py");
+  const py = spawn("python3", [scriptPath, "--cache-stats"], {
+    cwd: path.resolve(__dirname, ".."),
+    env: { ...process.env },
+  });
+
+  let stdout = "";
+  let stderr = "";
+  py.stdout.on("data", (d) => {
+    stdout += d.toString();
+  });
+  py.stderr.on("data", (d) => {
+    stderr += d.toString();
+  });
+  py.on("close", (code) => {
+    if (code === 0) {
+      try {
+        return res.json({ ok: true, ...JSON.parse(stdout.trim()) });
+      } catch (e) {
+        // fall through to the error response
+      }
+    }
+    res.status(500).json({ ok: false, code, error: stderr || stdout });
+  });
+});
+
 // Fetch current dashboard JSON
 app.get("/api/dashboard", (req, res) => {
   const jsonPath = path.join(publicDir, "invoice-dashboard.json");
@@ -164,16 +238,16 @@ app.post("/api/speech", (req, res) => {
   });
 });
 
+// Available PDFs mapping
+const availablePdfs = {
+  asteria: "Asteria_Overview.pdf",
+  greengrid: "GreenGrid_Overview.pdf",
+  buildright: "BuildRight_Overview.pdf",
+};
+
 // Plan generation endpoint
 app.post("/api/generate-plan", (req, res) => {
-  const { pdf_id } = req.body;
-
-  // Available PDFs mapping
-  const availablePdfs = {
-    asteria: "Asteria_Overview.pdf",
-    greengrid: "GreenGrid_Overview.pdf",
-    buildright: "BuildRight_Overview.pdf",
-  };
+  const { pdf_id, metrics } = req.body;
 
   if (!pdf_id || !availablePdfs[pdf_id]) {
     return res.status(400).json({
@@ -201,7 +275,9 @@ app.post("/api/generate-plan", (req, res) => {
 
   // Run the plan generator Python script
   const scriptPath = path.resolve(__dirname, "plan_generator_service.py");
-  const py = spawn("python3", [scriptPath, pdfPath], {
+  // metrics: true adds per-stage timings and counters to the response
+  const args = metrics ? [scriptPath, "--metrics", pdfPath] : [scriptPath, pdfPath];
+  const py = spawn("python3", args, {
     cwd: path.resolve(__dirname),
     env: { ...process.env },
   });
@@ -225,6 +301,7 @@ app.post("/api/generate-plan", (req, res) => {
           data: result.data,
           pdf_id: pdf_id,
           pdf_filename: pdfFilename,
+          ...(result.metrics && { metrics: result.metrics }),
         });
       } catch (e) {
         return res.status(500).json({
@@ -242,6 +319,70 @@ app.post("/api/generate-plan", (req, res) => {
   });
 });
 
+// Streaming plan generation: forwards the generator's newline-delimited JSON events
+// (overview, one per section, final context) as they are produced
+app.post("/api/generate-plan/stream", (req, res) => {
+  const { pdf_id } = req.body;
+
+  if (!pdf_id || !availablePdfs[pdf_id]) {
+    return res.status(400).json({
+      success: false,
+      error: "Invalid PDF ID. Must be one of: asteria, greengrid, buildright",
+    });
+  }
+
+  const pdfFilename = availablePdfs[pdf_id];
+  const pdfPath = path.resolve(
+    __dirname,
+    "..",
+    "plan_generator",
+    "pdfs",
+    pdfFilename
+  );
+
+  if (!fs.existsSync(pdfPath)) {
+    return res.status(404).json({
+      success: false,
+      error: `PDF file not found: ${pdfFilename}`,
+    });
+  }
+
+  const scriptPath = path.resolve(__dirname, "plan_generator_service.py");
+  const py = spawn("python3", [scriptPath, "--stream", pdfPath], {
+    cwd: path.resolve(__dirname),
+    env: { ...process.env },
+  });
+
+  res.setHeader("Content-Type", "application/x-ndjson");
+  res.setHeader("Cache-Control", "no-cache");
+
+  let stderr = "";
+  let sawEvent = false;
+
+  py.stdout.on("data", (d) => {
+    sawEvent = true;
+    res.write(d);
+  });
+  py.stderr.on("data", (d) => {
+    stderr += d.toString();
+  });
+
+  // Client went away before the plan finished: stop generating
+  res.on("close", () => {
+    if (!res.writableEnded) py.kill();
+  });
+
+  py.on("close", (code) => {
+    if (code !== 0 && !sawEvent) {
+      res.write(
+        JSON.stringify({ event: "error", success: false, code, error: stderr }) +
+          "\n"
+      );
+    }
+    res.end();
+  });
+});
+
 // Get available PDFs
 app.get("/api/available-pdfs", (req, res) => {
   res.json({
@@ -0,0 +1,146 @@
+import json
+import os
+import re
+from collections import defaultdict
+
+# Legal-form words that OCR keeps or drops inconsistently; they carry no identity.
+_SUFFIXES = {
+    'llc', 'ltd', 'inc', 'pty', 'plc', 'co', 'corp', 'corporation',
+    'company', 'group', 'limited', 'and', 'the',
+}
+
+
+def normalize_client_name(raw):
+    """
+    Reduce an OCR'd `Client:` block to a comparison key (first line, lowercased, no punctuation).
+    Blocks with nothing left (empty, only punctuation or legal-form words) share the
+    'unknown' key with the literal 'Unknown' fallback, so unresolved invoices group together.
+    """
+    first_line = next((ln for ln in str(raw or '').splitlines() if ln.strip()), '')
+    s = re.sub(r'[^a-z0-9]+', ' ', first_line.lower())
+    tokens = [t for t in s.split() if t not in _SUFFIXES]
+    return ' '.join(tokens) or 'unknown'
+
+
+def display_client_name(raw):
+    """Human-readable label for a client: the first non-empty line, whitespace collapsed."""
+    first_line = next((ln for ln in str(raw or '').splitlines() if ln.strip()), '')
+    return re.sub(r'\s+', ' ', first_line).strip() or 'Unknown'
+
+
+def _ngrams(key, n):
+    padded = f"{' ' * (n - 1)}{key} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+# -------------------- Resolver --------------------
+class ClientResolver:
+    """
+    Canonicalise noisy client names into stable ids.
+
+    Candidates are blocked on shared character n-grams (very common n-grams are
+    skipped), so each new name is only scored against the handful of clients it
+    could plausibly be, not all of them. Every key seen is cached, so repeat
+    names resolve with a single dict lookup.
+    """
+
+    def __init__(self, threshold=0.75, ngram=3, max_block_size=200):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.max_block_size = max_block_size
+        self.names = []                       # id -> canonical display name
+        self._grams = []                      # id -> n-gram set of the canonical key
+        self._by_key = {}                     # normalised key -> id
+        self._blocks = defaultdict(list)      # n-gram -> [id, ...]
+
+    def __len__(self):
+        return len(self.names)
+
+    def resolve(self, raw):
+        """Return the client id for a raw `Client:` string, creating a new client if nothing matches."""
+        key = normalize_client_name(raw)
+        cid = self._by_key.get(key)
+        if cid is not None:
+            return cid
+
+        grams = _ngrams(key, self.ngram)
+        cid = self._best_match(grams)
+        if cid is None:
+            cid = self._new_client(display_client_name(raw) if key != 'unknown' else 'Unknown', grams)
+        self._by_key[key] = cid
+        return cid
+
+    def resolve_many(self, raws):
+        return [self.resolve(r) for r in raws]
+
+    def canonical_name(self, cid):
+        return self.names[cid]
+
+    def canonicalize(self, raw):
+        return self.names[self.resolve(raw)]
+
+    def _best_match(self, grams):
+        shared = defaultdict(int)
+        for g in grams:
+            block = self._blocks.get(g)
+            if block and len(block) <= self.max_block_size:
+                for cid in block:
+                    shared[cid] += 1
+
+        best_id, best_score = None, self.threshold
+        for cid, overlap in shared.items():
+            # Dice coefficient over n-gram sets
+            score = 2.0 * overlap / (len(grams) + len(self._grams[cid]))
+            if score >= best_score:
+                best_id, best_score = cid, score
+        return best_id
+
+    def _new_client(self, name, grams):
+        cid = len(self.names)
+        self.names.append(name)
+        self._grams.append(grams)
+        for g in grams:
+            self._blocks[g].append(cid)
+        return cid
+
+    # Persistence: canonical names plus every alias key, so later runs resolve known clients in O(1)
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        payload = {
+            'threshold': self.threshold,
+            'ngram': self.ngram,
+            'names': self.names,
+            'aliases': self._by_key,
+        }
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        with open(path) as f:
+            payload = json.load(f)
+        resolver = cls(
+            threshold=kwargs.get('threshold', payload.get('threshold', 0.75)),
+            ngram=payload.get('ngram', 3),
+            max_block_size=kwargs.get('max_block_size', 200),
+        )
+        for name in payload.get('names', []):
+            resolver._new_client(name, _ngrams(normalize_client_name(name), resolver.ngram))
+        for key, cid in payload.get('aliases', {}).items():
+            if 0 <= cid < len(resolver.names):
+                resolver._by_key[key] = cid
+        return resolver
+
+    @classmethod
+    def from_names(cls, names, **kwargs):
+        """A resolver whose client ids are the positions of `names` (None for an unused id)."""
+        resolver = cls(**kwargs)
+        for name in names:
+            key = normalize_client_name(name)
+            cid = resolver._new_client(name or 'Unknown', _ngrams(key, resolver.ngram))
+            resolver._by_key.setdefault(key, cid)
+        return resolver
@@ -28,7 +28,7 @@ import {
 } from "lucide-react";
 import {
   fetchDashboardJson,
-  toCategoryBreakdownFromClients,
+  toCategoryBreakdown,
 } from "../../utils/invoiceAdapter";
 
 const fallbackCategoryData = [
@@ -153,7 +153,7 @@ export function CategoryBreakdown() {
     (async () => {
       try {
         const json = await fetchDashboardJson();
-        const mapped = toCategoryBreakdownFromClients(json);
+        const mapped = toCategoryBreakdown(json);
         // 无法映射图标：保持默认一套图标用于前 N 个条目
         const withIcons = mapped.categoryData.map((c, idx) => ({
           ...c,
@@ -7,9 +7,16 @@ import re
 import json
 from datetime import datetime, timedelta
 import os
+import sys
 import warnings
+from client_resolution import ClientResolver
+from invoice_categorizer import InvoiceCategorizer, invoice_text
+from invoice_store import InvoiceStore
 warnings.filterwarnings('ignore')
 
+CATEGORY_LABELS_PATH = "src/assets/invoice-categories.csv"
+INVOICE_STORE_PATH = "src/assets/invoice-store"
+
 # -------------------- OCR Engine --------------------
 class InvoiceOCR:
     def __init__(self):
@@ -68,12 +75,21 @@ class InvoiceOCR:
         # VAT = 10% of total
         invoice_data['vat'] = round(total_amount * 0.10, 2)
 
+        # Line items: "1. Description 2,00 each ..." -> description only (feeds the categoriser)
+        invoice_data['items'] = [
+            {'description': d.strip()}
+            for d in re.findall(r'^\s*\d+\.?\s+(.+?)\s+\d+[,.]\d+\s+each\b', text, re.IGNORECASE | re.MULTILINE)
+        ]
+
         return invoice_data
 
 # -------------------- Analyzer --------------------
 class ExpenditureAnalyzer:
-    def __init__(self):
+    def __init__(self, client_resolver=None, categorizer=None, store=None):
         self.invoices_data = []
+        self.client_resolver = client_resolver or ClientResolver()
+        self.categorizer = categorizer
+        self.store = store
 
     def add_invoice_data(self, invoice_data):
         self.invoices_data.append(invoice_data)
@@ -91,24 +107,36 @@ class ExpenditureAnalyzer:
                 invoice_data = ocr_engine.parse_invoice_data(text)
                 self.add_invoice_data(invoice_data)
 
-    # Analyze spending
-    def analyze_spending_patterns(self):
-        if not self.invoices_data:
-            print("No invoice data available for analysis")
-            return
-
+    # Build the analysis frame from freshly parsed invoices
+    def _invoices_to_frame(self):
         df_data = []
         for inv in self.invoices_data:
+            # OCR spells the same client many ways; group on the resolved canonical name
+            client_id = self.client_resolver.resolve(inv.get('client', 'Unknown'))
             df_data.append({
                 'Invoice_No': inv['invoice_no'],
                 'Date': pd.to_datetime(inv['date']),
                 'Total_Amount': inv['total_amount'],
                 'VAT': inv['vat'],
                 'Net_Amount': inv['net_amount'],
-                'Client': inv.get('client', 'Unknown')
+                'Client_Id': client_id,
+                'Client': self.client_resolver.canonical_name(client_id)
             })
 
         df = pd.DataFrame(df_data)
+        df['Category'] = self.categorize_invoices(self.invoices_data)
+        return df
+
+    # Analyze spending
+    def analyze_spending_patterns(self):
+        if self.invoices_data:
+            df = self._invoices_to_frame()
+        elif self.store is not None and len(self.store):
+            # Reanalysis straight from the memory-mapped history, no OCR or JSON parse
+            df = self.store.to_frame()
+        else:
+            print("No invoice data available for analysis")
+            return
 
         analysis = {}
         analysis['total_spent'] = df['Total_Amount'].sum()
@@ -119,6 +147,7 @@ class ExpenditureAnalyzer:
         df['Month'] = df['Date'].dt.to_period('M')
         analysis['monthly_spending'] = df.groupby('Month')['Total_Amount'].sum()
         analysis['client_spending'] = df.groupby('Client')['Total_Amount'].sum()
+        analysis['category_spending'] = df.groupby('Category')['Total_Amount'].sum()
 
         print("=== EXPENDITURE ANALYSIS ===\n")
         print(f"Total Amount Spent: ${analysis['total_spent']:.2f}")
@@ -129,6 +158,14 @@ class ExpenditureAnalyzer:
 
         return analysis, df
 
+    # Categorise all invoices in one vectorised batch
+    def categorize_invoices(self, invoices):
+        explicit = [inv.get('category') for inv in invoices]
+        if self.categorizer is None:
+            return [c or 'General' for c in explicit]
+        predicted = self.categorizer.predict([invoice_text(inv) for inv in invoices])
+        return [c or p for c, p in zip(explicit, predicted)]
+
     # Visualizations
     def create_visualizations(self, df):
         plt.style.use('default')
@@ -145,8 +182,7 @@ class ExpenditureAnalyzer:
 
         # Client-wise bar chart
         client_data = df.groupby('Client')['Total_Amount'].sum()
-        client_labels = [' '.join(c.split()[:2]) for c in client_data.index]  # First two words
-        axes[0, 1].bar(client_labels, client_data.values, color='skyblue', edgecolor='black')
+        axes[0, 1].bar(list(client_data.index), client_data.values, color='skyblue', edgecolor='black')
         axes[0, 1].set_title('Spending by Client', fontweight='bold')
         axes[0, 1].tick_params(axis='x', rotation=45)
 
@@ -218,6 +254,12 @@ class ExpenditureAnalyzer:
             {"client": str(c), "amount": float(v)} for c, v in client_spending_series.items()
         ]
 
+        # 聚合：按类别
+        category_spending_series = df.groupby('Category')['Total_Amount'].sum().sort_values(ascending=False)
+        category_spending = [
+            {"category": str(c), "amount": float(v)} for c, v in category_spending_series.items()
+        ]
+
         # 散点：VAT vs Net（逐发票）
         vat_vs_net = [
             {"net": float(row['Net_Amount']), "vat": float(row['VAT'])}
@@ -288,6 +330,7 @@ class ExpenditureAnalyzer:
             },
             "monthly_spending": monthly_spending,
             "client_spending": client_spending,
+            "category_spending": category_spending,
             "vat_vs_net": vat_vs_net,
             "invoice_amount_distribution": invoice_amount_distribution,
             "vat_analysis": vat_analysis,
@@ -299,7 +342,9 @@ class ExpenditureAnalyzer:
                     "total_amount": float(row['Total_Amount']),
                     "vat": float(row['VAT']),
                     "net_amount": float(row['Net_Amount']),
-                    "client": str(row['Client'])
+                    "client": str(row['Client']),
+                    "client_id": int(row['Client_Id']),
+                    "category": str(row['Category'])
                 }
                 for _, row in df.iterrows()
             ]
@@ -312,16 +357,23 @@ class ExpenditureAnalyzer:
 
 # -------------------- Main --------------------
 def main():
-    ocr_engine = InvoiceOCR()
-    analyzer = ExpenditureAnalyzer()
+    store = InvoiceStore(INVOICE_STORE_PATH)
+    categorizer = InvoiceCategorizer.from_labelled_file(CATEGORY_LABELS_PATH) if os.path.exists(CATEGORY_LABELS_PATH) else None
+    analyzer = ExpenditureAnalyzer(store.client_resolver(), categorizer, store)
 
-    folder_path = "src/assets/invoices"
-    print("=== Processing Invoice Images ===\n")
-    analyzer.process_invoices_from_folder(folder_path, ocr_engine)
+    # --from-store: re-export the dashboard from the persisted invoice history without OCR
+    if '--from-store' not in sys.argv[1:]:
+        ocr_engine = InvoiceOCR()
+        folder_path = "src/assets/invoices"
+        print("=== Processing Invoice Images ===\n")
+        analyzer.process_invoices_from_folder(folder_path, ocr_engine)
 
     result = analyzer.analyze_spending_patterns()
     if result is not None:
         analysis_results, df = result
+        if analyzer.invoices_data:
+            added = store.append(df, resolver=analyzer.client_resolver)
+            print(f"Stored {added} new invoices -> {INVOICE_STORE_PATH} ({len(store)} total)\n")
         analyzer.create_visualizations(df)
         predictions = analyzer.predict_future_spending(df, months_ahead=6)
         analyzer.export_dashboard_json(analysis_results, df, predictions)
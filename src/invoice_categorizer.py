@@ -0,0 +1,121 @@
+import csv
+import re
+import zlib
+import numpy as np
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_BIAS_TOKEN = '__bias__'
+
+
+# -------------------- Hashing vectoriser --------------------
+class HashingVectorizer:
+    """
+    Map free text to sparse hashed features (unigrams + bigrams).
+
+    Uses crc32 rather than hash() so feature indices are stable across processes.
+    A batch is returned as flat (indices, values, offsets) arrays, which is all the
+    linear model needs and avoids a scipy dependency.
+    """
+
+    def __init__(self, n_features=2 ** 14):
+        self.n_features = n_features
+        self._index_cache = {}
+
+    def _index(self, token):
+        idx = self._index_cache.get(token)
+        if idx is None:
+            idx = zlib.crc32(token.encode('utf-8')) % self.n_features
+            self._index_cache[token] = idx
+        return idx
+
+    def _doc_indices(self, text):
+        words = _TOKEN_RE.findall(str(text or '').lower())
+        tokens = [_BIAS_TOKEN] + words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+        return sorted({self._index(t) for t in tokens})
+
+    def transform(self, texts):
+        indices, offsets, values = [], [], []
+        for text in texts:
+            doc = self._doc_indices(text)
+            offsets.append(len(indices))
+            indices.extend(doc)
+            values.extend([1.0 / np.sqrt(len(doc))] * len(doc))
+        return (np.asarray(indices, dtype=np.int64),
+                np.asarray(values, dtype=np.float64),
+                np.asarray(offsets, dtype=np.int64))
+
+
+# -------------------- Linear model --------------------
+class InvoiceCategorizer:
+    """
+    Softmax-regression categoriser over hashed invoice text (client + line items).
+
+    Prediction for a whole invoice table is a single gather + reduceat over the
+    weight matrix, i.e. a few microseconds per invoice.
+    """
+
+    def __init__(self, n_features=2 ** 14, epochs=300, learning_rate=1.0, l2=1e-4):
+        self.vectorizer = HashingVectorizer(n_features)
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.classes_ = []
+        self.weights = None
+
+    @staticmethod
+    def _scores(weights, X):
+        indices, values, offsets = X
+        return np.add.reduceat(weights[indices] * values[:, None], offsets, axis=0)
+
+    def fit(self, texts, labels):
+        self.classes_ = sorted(set(labels))
+        class_index = {c: i for i, c in enumerate(self.classes_)}
+        y = np.array([class_index[c] for c in labels])
+        X = self.vectorizer.transform(texts)
+        indices, values, offsets = X
+        n_docs, n_classes = len(y), len(self.classes_)
+        doc_of_token = np.repeat(np.arange(n_docs), np.diff(np.append(offsets, len(indices))))
+
+        targets = np.zeros((n_docs, n_classes))
+        targets[np.arange(n_docs), y] = 1.0
+        self.weights = np.zeros((self.vectorizer.n_features, n_classes))
+
+        for _ in range(self.epochs):
+            probs = _softmax(self._scores(self.weights, X))
+            err = (probs - targets) / n_docs
+            grad = np.zeros_like(self.weights)
+            np.add.at(grad, indices, values[:, None] * err[doc_of_token])
+            grad += self.l2 * self.weights
+            self.weights -= self.learning_rate * grad
+        return self
+
+    def predict(self, texts):
+        texts = list(texts)
+        if not texts or self.weights is None:
+            return np.array(['General'] * len(texts), dtype=object)
+        scores = self._scores(self.weights, self.vectorizer.transform(texts))
+        return np.asarray(self.classes_, dtype=object)[scores.argmax(axis=1)]
+
+    @classmethod
+    def from_labelled_file(cls, path, **kwargs):
+        """Train from a CSV with `category,text` columns."""
+        texts, labels = [], []
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                if row.get('category') and row.get('text'):
+                    labels.append(row['category'].strip())
+                    texts.append(row['text'])
+        return cls(**kwargs).fit(texts, labels)
+
+
+def invoice_text(invoice):
+    """Text the categoriser sees for one invoice: client block plus line-item descriptions."""
+    items = invoice.get('items') or []
+    descriptions = [i.get('description', '') if isinstance(i, dict) else str(i) for i in items]
+    return ' '.join([str(invoice.get('client', ''))] + descriptions)
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
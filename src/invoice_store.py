@@ -0,0 +1,215 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from client_resolution import ClientResolver
+
+# 2: client_id holds ClientResolver ids and clients.json is indexed by them
+STORE_VERSION = 2
+INVOICE_NO_BYTES = 32
+
+# Fixed-width columns; strings with few distinct values are dictionary-encoded
+COLUMNS = {
+    'invoice_no': f'S{INVOICE_NO_BYTES}',
+    'date': 'M8[D]',
+    'total_amount': '<f8',
+    'vat': '<f8',
+    'net_amount': '<f8',
+    'client_id': '<i4',
+    'category_id': '<i4',
+}
+DICTIONARIES = {'client_id': 'clients.json', 'category_id': 'categories.json'}
+# ClientResolver state, saved with every append so client ids and names never drift apart
+RESOLVER_FILE = 'client-resolver.json'
+
+
+def _fit_invoice_no(no):
+    """Cut an invoice number to the column width on a character boundary."""
+    return no.encode('utf-8')[:INVOICE_NO_BYTES].decode('utf-8', 'ignore')
+
+
+def _row_keys(df, invoice_nos):
+    """Dedupe key per row: the invoice number, or (date, total, client) when OCR could not read it."""
+    dates = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
+    return [no if no != 'Unknown' else (no, d, round(float(t), 2), str(c))
+            for no, d, t, c in zip(invoice_nos, dates, df['Total_Amount'], df['Client'])]
+
+
+# -------------------- Columnar store --------------------
+class InvoiceStore:
+    """
+    Append-only columnar store for parsed invoices.
+
+    Each column is a raw little-endian file read through np.memmap, so opening a
+    store of any size only reads meta.json and the dictionaries. Appends write
+    the new rows to the end of every column file and then atomically bump the
+    row count in meta.json; bytes past that count (from an interrupted append)
+    are ignored and overwritten by the next append.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_json('meta.json', None)
+        if meta is None:
+            meta = {'version': STORE_VERSION, 'rows': 0, 'columns': COLUMNS}
+            self._write_json('meta.json', meta)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"{path}: store version {meta.get('version')} is not {STORE_VERSION}; "
+                             f"remove it and re-run the OCR pass to rebuild it")
+        self.rows = int(meta['rows'])
+        self.dictionaries = {col: self._read_json(fname, []) for col, fname in DICTIONARIES.items()}
+        self._codes = {col: {v: i for i, v in enumerate(vals)} for col, vals in self.dictionaries.items()}
+        self._known_keys = None
+
+    def __len__(self):
+        return self.rows
+
+    # ---- reading ----
+    def column(self, name):
+        """Memory-mapped, read-only view of one column (no data is read until accessed)."""
+        if self.rows == 0:
+            return np.empty(0, dtype=COLUMNS[name])
+        return np.memmap(self._col_path(name), dtype=COLUMNS[name], mode='r', shape=(self.rows,))
+
+    def decode(self, name, codes):
+        values = np.asarray([v if v is not None else 'Unknown' for v in self.dictionaries[name]] + ['Unknown'],
+                            dtype=object)
+        return values[np.where(codes < 0, len(values) - 1, codes)]
+
+    def to_frame(self, start=None, stop=None):
+        """Load rows [start:stop] into the DataFrame shape used by ExpenditureAnalyzer."""
+        sl = slice(start, stop)
+        client_ids = np.asarray(self.column('client_id')[sl])
+        return pd.DataFrame({
+            'Invoice_No': np.char.decode(np.asarray(self.column('invoice_no')[sl]), 'utf-8'),
+            'Date': pd.to_datetime(np.asarray(self.column('date')[sl])),
+            'Total_Amount': np.asarray(self.column('total_amount')[sl]),
+            'VAT': np.asarray(self.column('vat')[sl]),
+            'Net_Amount': np.asarray(self.column('net_amount')[sl]),
+            'Client_Id': client_ids,
+            'Client': self.decode('client_id', client_ids),
+            'Category': self.decode('category_id', np.asarray(self.column('category_id')[sl])),
+        })
+
+    def client_resolver(self, **kwargs):
+        """
+        The ClientResolver whose ids this store holds. A store whose resolver file is missing
+        gets one rebuilt from clients.json, so known clients keep their ids.
+        """
+        p = os.path.join(self.path, RESOLVER_FILE)
+        if os.path.exists(p):
+            return ClientResolver.load(p, **kwargs)
+        return ClientResolver.from_names(self.dictionaries['client_id'], **kwargs)
+
+    # ---- writing ----
+    def append(self, df, dedupe=True, resolver=None):
+        """
+        Append analyzer rows (Invoice_No, Date, Total_Amount, VAT, Net_Amount, Client_Id, Client,
+        Category). With dedupe, rows already in the store or earlier in the batch are skipped:
+        matched on invoice number, or on (date, total, client) when OCR could not read the number.
+        `resolver`, the ClientResolver that assigned Client_Id, is saved along with the rows.
+        Returns rows written.
+        """
+        invoice_nos = [_fit_invoice_no(no) for no in df['Invoice_No'].astype(str)]
+        keys = _row_keys(df, invoice_nos)
+        if dedupe and len(df):
+            seen = set(self._row_keys())
+            keep = []
+            for key in keys:
+                keep.append(key not in seen)
+                seen.add(key)
+            df = df[keep]
+            invoice_nos = [no for no, k in zip(invoice_nos, keep) if k]
+            keys = [key for key, k in zip(keys, keep) if k]
+        if not len(df):
+            if resolver is not None:
+                resolver.save(os.path.join(self.path, RESOLVER_FILE))
+            return 0
+
+        client_codes = self._client_ids(df)
+        category = df['Category'] if 'Category' in df else pd.Series(['General'] * len(df))
+        category_codes = self._encode('category_id', category.astype(str))
+        new_columns = {
+            'invoice_no': np.array([no.encode('utf-8') for no in invoice_nos], dtype=COLUMNS['invoice_no']),
+            'date': pd.to_datetime(df['Date']).values.astype(COLUMNS['date']),
+            'total_amount': df['Total_Amount'].to_numpy(dtype=COLUMNS['total_amount']),
+            'vat': df['VAT'].to_numpy(dtype=COLUMNS['vat']),
+            'net_amount': df['Net_Amount'].to_numpy(dtype=COLUMNS['net_amount']),
+            'client_id': client_codes,
+            'category_id': category_codes,
+        }
+
+        for col, values in new_columns.items():
+            with open(self._col_path(col), 'ab') as f:
+                f.truncate(self.rows * np.dtype(COLUMNS[col]).itemsize)  # drop any torn tail
+                f.write(np.ascontiguousarray(values).tobytes())
+        for col, fname in DICTIONARIES.items():
+            self._write_json(fname, self.dictionaries[col])
+        if resolver is not None:
+            resolver.save(os.path.join(self.path, RESOLVER_FILE))
+
+        # meta.json last: the rows only count once everything they refer to is on disk
+        self.rows += len(df)
+        self._write_json('meta.json', {'version': STORE_VERSION, 'rows': self.rows, 'columns': COLUMNS})
+        if self._known_keys is not None:
+            self._known_keys.update(keys)
+        return len(df)
+
+    def _client_ids(self, df):
+        """
+        The analyzer's ClientResolver ids, so --from-store frames group clients exactly as
+        fresh ones do; clients.json[id] keeps each id's canonical name. An id already stored
+        under another name means the resolver is not the one this store was written with
+        (see client_resolver()), and is refused rather than relabelling history. Frames
+        without Client_Id fall back to dictionary codes.
+        """
+        if 'Client_Id' not in df:
+            return self._encode('client_id', df['Client'].astype(str))
+        names = list(self.dictionaries['client_id'])
+        ids = df['Client_Id'].to_numpy(dtype=COLUMNS['client_id'])
+        for cid, name in zip(ids.tolist(), df['Client'].astype(str)):
+            if cid >= len(names):
+                names.extend([None] * (cid + 1 - len(names)))
+            if names[cid] is not None and names[cid] != name:
+                raise ValueError(f"{self.path}: client id {cid} is stored as {names[cid]!r}, not {name!r}; "
+                                 f"resolve clients with InvoiceStore.client_resolver()")
+            names[cid] = name
+        self.dictionaries['client_id'] = names
+        self._codes['client_id'] = {v: i for i, v in enumerate(names) if v is not None}
+        return ids
+
+    def _encode(self, col, values):
+        codes, vocab = self._codes[col], self.dictionaries[col]
+        out = np.empty(len(values), dtype=COLUMNS[col])
+        for i, v in enumerate(values):
+            code = codes.get(v)
+            if code is None:
+                code = codes[v] = len(vocab)
+                vocab.append(v)
+            out[i] = code
+        return out
+
+    def _row_keys(self):
+        if self._known_keys is None:
+            df = self.to_frame()
+            self._known_keys = set(_row_keys(df, df['Invoice_No'].tolist()))
+        return self._known_keys
+
+    # ---- files ----
+    def _col_path(self, name):
+        return os.path.join(self.path, f'{name}.bin')
+
+    def _read_json(self, fname, default):
+        p = os.path.join(self.path, fname)
+        if not os.path.exists(p):
+            return default
+        with open(p) as f:
+            return json.load(f)
+
+    def _write_json(self, fname, payload):
+        p = os.path.join(self.path, fname)
+        tmp = p + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp, p)
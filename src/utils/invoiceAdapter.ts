@@ -10,6 +10,7 @@ export type DashboardJson = {
   };
   monthly_spending: { month: string; amount: number }[]; // month: 'YYYY-MM'
   client_spending: { client: string; amount: number }[];
+  category_spending?: { category: string; amount: number }[];
   vat_vs_net: { net: number; vat: number }[];
   invoice_amount_distribution: {
     range: string;
@@ -25,7 +26,9 @@ export type DashboardJson = {
     total_amount: number;
     vat: number;
     net_amount: number;
-    client: string;
+    client: string; // canonical client name (OCR variants resolved)
+    client_id?: number;
+    category?: string;
   }>;
 };
 
@@ -280,6 +283,34 @@ export function toCategoryBreakdownFromClients(
   return { categoryData, monthlyBreakdown };
 }
 
+// -------- CategoryBreakdown from predicted invoice categories --------
+export function toCategoryBreakdown(
+  json: DashboardJson,
+  topN = 7
+): {
+  categoryData: CategoryItem[];
+  monthlyBreakdown: MonthlyCategoryBreakdown[];
+} {
+  // Older dashboard JSON has no categories; fall back to the client approximation
+  if (!json.category_spending || json.category_spending.length === 0) {
+    return toCategoryBreakdownFromClients(json, topN);
+  }
+  return toCategoryBreakdownFromClients(
+    {
+      ...json,
+      client_spending: json.category_spending.map((c) => ({
+        client: c.category,
+        amount: c.amount,
+      })),
+      invoices: json.invoices.map((inv) => ({
+        ...inv,
+        client: inv.category || "General",
+      })),
+    },
+    topN
+  );
+}
+
 // -------- Fetch helper --------
 export async function fetchDashboardJson(): Promise<DashboardJson> {
   const res = await fetch("/invoice-dashboard.json");
@@ -293,4 +324,4 @@ export async function fetchDashboardJson(): Promise<DashboardJson> {
 // const dist = toInvoiceDistribution(json);
 // const trends = toSpendingTrends(json);
 // const fc = toForecasting(json);
-// const cats = toCategoryBreakdownFromClients(json);
+// const cats = toCategoryBreakdown(json);